@@ -5,17 +5,35 @@ using AI models. Designed for transformative fair use AI analysis.
 """
 
 import logging
+import os
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-from abc import ABC, abstractmethod
-from datetime import datetime
+from typing import Dict, Any, Optional, List, Protocol
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Background writer for analysis result files
+# Why: keeps file I/O out of the analysis request path
+_SAVE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="analysis-save")
+
 
 class VideoAnalysisResult:
     """Result of AI video analysis."""
 
+    # (attribute, label) pairs rendered by to_text(), in output order
+    _TEXT_SECTIONS = (
+        ("summary", "Summary"),
+        ("description", "Description"),
+        ("transcript", "Transcript"),
+        ("keywords", "Keywords"),
+        ("detected_objects", "Detected Objects"),
+        ("detected_text", "Detected Text"),
+        ("sentiment", "Sentiment"),
+    )
+
     def __init__(
         self,
         video_path: Path,
@@ -50,7 +68,9 @@ class VideoAnalysisResult:
         self.detected_text = detected_text or []
         self.sentiment = sentiment
         self.metadata = metadata or {}
-        self.analyzed_at = datetime.utcnow()
+        self.analyzed_at = datetime.now(timezone.utc)
+        # Formatted once; to_dict()/to_text() reuse it
+        self._analyzed_at_iso = self.analyzed_at.isoformat(timespec="seconds")
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -64,45 +84,31 @@ class VideoAnalysisResult:
             "detected_text": self.detected_text,
             "sentiment": self.sentiment,
             "metadata": self.metadata,
-            "analyzed_at": self.analyzed_at.isoformat(),
+            "analyzed_at": self._analyzed_at_iso,
         }
 
     def to_text(self) -> str:
         """Convert analysis to plain text format."""
-        lines = [
+        parts = [
             f"Video Analysis: {self.video_path.name}",
-            f"Analyzed: {self.analyzed_at.isoformat()}",
+            f"Analyzed: {self._analyzed_at_iso}",
             "",
         ]
 
-        if self.summary:
-            lines.extend(["Summary:", self.summary, ""])
-
-        if self.description:
-            lines.extend(["Description:", self.description, ""])
-
-        if self.transcript:
-            lines.extend(["Transcript:", self.transcript, ""])
+        # One "Label:\nvalue\n" block per populated section
+        for attr, label in self._TEXT_SECTIONS:
+            value = getattr(self, attr)
+            if value:
+                if isinstance(value, list):
+                    value = ", ".join(value)
+                parts.append(f"{label}:\n{value}\n")
 
-        if self.keywords:
-            lines.extend(["Keywords:", ", ".join(self.keywords), ""])
+        return "\n".join(parts)
 
-        if self.detected_objects:
-            lines.extend(["Detected Objects:", ", ".join(self.detected_objects), ""])
 
-        if self.detected_text:
-            lines.extend(["Detected Text:", ", ".join(self.detected_text), ""])
+class BaseVideoAnalyzer(Protocol):
+    """Interface for video analyzers (any object with a matching analyze())."""
 
-        if self.sentiment:
-            lines.extend(["Sentiment:", self.sentiment, ""])
-
-        return "\n".join(lines)
-
-
-class BaseVideoAnalyzer(ABC):
-    """Abstract base class for video analyzers."""
-
-    @abstractmethod
     def analyze(self, video_path: Path) -> VideoAnalysisResult:
         """Analyze video and extract information.
 
@@ -115,7 +121,7 @@ class BaseVideoAnalyzer(ABC):
         Raises:
             Exception: If analysis fails
         """
-        pass
+        ...
 
 
 class MockVideoAnalyzer(BaseVideoAnalyzer):
@@ -203,6 +209,8 @@ class VideoAnalyzer:
             analyzer: Specific analyzer implementation (defaults to MockVideoAnalyzer)
         """
         self.analyzer = analyzer or MockVideoAnalyzer()
+        # Bound once so each analysis skips the attribute lookup
+        self._analyze = self.analyzer.analyze
 
     def analyze_video(
         self,
@@ -228,35 +236,55 @@ class VideoAnalyzer:
             raise FileNotFoundError(f"Video not found: {video_path}")
 
         logger.info(f"Analyzing video: {video_path}")
-        result = self.analyzer.analyze(video_path)
+        result = self._analyze(video_path)
 
         if save_result:
             self._save_result(result, output_format)
 
         return result
 
-    def _save_result(self, result: VideoAnalysisResult, output_format: str):
-        """Save analysis result to file.
+    def _save_result(self, result: VideoAnalysisResult, output_format: str) -> Future:
+        """Queue analysis result to be saved to file in the background.
 
         Args:
             result: Analysis result
             output_format: Output format ('json' or 'text')
+
+        Returns:
+            Future resolving to the saved file path
         """
-        import json
+        return _SAVE_POOL.submit(self._write_result, result, output_format)
+
+    def _write_result(self, result: VideoAnalysisResult, output_format: str) -> Path:
+        """Write analysis result to file (runs on the save pool).
 
-        output_dir = result.video_path.parent
-        base_name = result.video_path.stem
+        Args:
+            result: Analysis result
+            output_format: Output format ('json' or 'text')
 
-        if output_format == "json":
-            output_file = output_dir / f"{base_name}_analysis.json"
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(result.to_dict(), f, ensure_ascii=False, indent=2)
-        else:  # text
-            output_file = output_dir / f"{base_name}_analysis.txt"
-            with open(output_file, "w", encoding="utf-8") as f:
-                f.write(result.to_text())
+        Returns:
+            Path to the saved file
+        """
+        # Build the output path as a plain string; open() accepts str directly
+        base_path, _ = os.path.splitext(os.fspath(result.video_path))
+
+        try:
+            if output_format == "json":
+                output_file = f"{base_path}_analysis.json"
+                # orjson emits UTF-8 directly, so Korean text stays unescaped
+                with open(output_file, "wb") as f:
+                    f.write(orjson.dumps(result.to_dict(), default=str, option=orjson.OPT_INDENT_2))
+            else:  # text
+                output_file = f"{base_path}_analysis.txt"
+                with open(output_file, "w", encoding="utf-8") as f:
+                    f.write(result.to_text())
+        except Exception as e:
+            # Nobody awaits the future on the request path, so log here
+            logger.error(f"Failed to save analysis result for {result.video_path}: {e}")
+            raise
 
         logger.info(f"Saved analysis result: {output_file}")
+        return Path(output_file)
 
 
 # Global analyzer instance (using mock by default)
@@ -282,14 +310,14 @@ def analyze_and_cleanup(video_path: Path) -> VideoAnalysisResult:
         FileNotFoundError: If video doesn't exist
         Exception: If analysis fails
     """
-    from app.temp_storage import temp_storage
-
     # Analyze video
     result = video_analyzer.analyze_video(video_path, save_result=True)
 
-    # Delete video using temp storage context manager
-    if video_path.exists():
+    # Delete video (unlink reports a missing file, no separate exists() probe)
+    try:
         video_path.unlink()
         logger.info(f"Deleted video after analysis: {video_path}")
+    except FileNotFoundError:
+        pass
 
     return result
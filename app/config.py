@@ -3,6 +3,7 @@
 Centralizes all configuration with type validation and environment variable support.
 """
 
+import functools
 from pathlib import Path
 from typing import Literal, Optional
 
@@ -26,29 +27,43 @@ class Settings(BaseSettings):
     # Storage Configuration
     download_dir: Path = Path("./downloads")
     max_file_size_mb: int = 100
+    max_concurrent_downloads: int = 8  # Worker threads for blocking downloads
+    max_download_queue: int = 32  # Requests allowed to wait for a download slot before 503
+    max_concurrent_analyses: int = 2  # Worker threads for /analyze, separate from downloads
+    accel_redirect_prefix: Optional[str] = None  # e.g. "/protected-downloads" to let nginx send /downloads files
 
     # Rate Limiting
     rate_limit_per_minute: int = 10
+    # Counter storage shared by all workers, e.g. "redis://localhost:6379/0"; the
+    # default keeps per-process counters, so N workers allow N x the limit
+    rate_limit_storage_uri: str = "memory://"
 
     # Instagram Scraping
     user_agent: str = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
     request_timeout_seconds: int = 30
     max_retries: int = 3
+    instagram_requests_per_second: float = 5.0  # Shared by the GraphQL and proxy clients
+    instagram_request_burst: int = 10
+    instagram_rate_limit_max_wait_seconds: float = 15.0  # Longer pauses fail fast with 429
 
     # Instagram Authentication (Optional - for carousel/private content support)
     instagram_username: Optional[str] = None
     instagram_password: Optional[str] = None
+    instagram_session_file: Path = Path("./.instaloader_session")  # Reused across restarts; keep outside download_dir
 
     # Metadata Collection
     save_metadata: bool = True  # Save captions, hashtags, etc. to JSON
     include_comments: bool = False  # Fetch comments (requires Instagram auth)
     max_comments: int = 50  # Maximum comments to fetch per post
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        # Ensure download directory exists on initialization
-        self.download_dir.mkdir(parents=True, exist_ok=True)
+
+@functools.lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, creating the download directory once."""
+    instance = Settings()
+    instance.download_dir.mkdir(parents=True, exist_ok=True)
+    return instance
 
 
 # Global settings instance - initialized once at startup
-settings = Settings()
+settings = get_settings()
@@ -12,16 +12,20 @@ Design considerations:
 - Supports videos, photos, and carousel posts
 """
 
+import asyncio
 import logging
 import json
+import os
+import random
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple, Dict, Any
-from datetime import datetime
+from typing import Optional, Tuple, Dict, Any, Iterable, List, Union
+from datetime import datetime, timezone
 
 import yt_dlp
-import requests
 from PIL import Image
-from io import BytesIO
 
 from app.config import settings
 from app.exceptions import (
@@ -34,10 +38,68 @@ from app.exceptions import (
 from app.models import MediaMetadata
 from app.metadata_extractor import InstagramMetadataExtractor
 from app.metadata_storage import MetadataStorage
+from app.http_client import make_session
 from app.instagram_proxy import InstagramProxyDownloader
 
 logger = logging.getLogger(__name__)
 
+# yt-dlp error text classifiers, checked in order (first match wins).
+# Why: one precompiled case-insensitive scan per category instead of
+# lower()-ing the message and running a chain of substring checks.
+_YTDLP_ERROR_PATTERNS = (
+    ('private', re.compile(r'private|unavailable', re.I)),
+    ('not_found', re.compile(r'404|not found|removed', re.I)),
+    ('rate_limit', re.compile(r'429|too many requests|rate limit', re.I)),
+    ('api_change', re.compile(r'http error|unable to extract', re.I)),
+)
+
+# Leading bytes of every JPEG file (SOI marker + first segment marker)
+JPEG_MAGIC = b'\xff\xd8\xff'
+
+# Extensions of media files written by the download strategies
+MEDIA_SUFFIXES = frozenset({'.mp4', '.webm', '.mov', '.jpg', '.jpeg', '.png'})
+
+
+def _file_size(path: Path) -> Optional[int]:
+    """Return file size in bytes with a single stat, or None if missing."""
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return None
+
+
+def _scan_download_dir(path: str) -> Optional[Tuple[Path, Optional[Path], MediaMetadata]]:
+    """Find a completed download in one shortcode directory with a single scan.
+
+    Returns:
+        (media_path, thumbnail_path, metadata) for the newest media file, or
+        None if the directory holds no media
+    """
+    shortcode = os.path.basename(path)
+    media = None
+    thumbnail = None
+
+    with os.scandir(path) as entries:
+        for entry in entries:
+            name = entry.name
+            if not entry.is_file() or os.path.splitext(name)[1] not in MEDIA_SUFFIXES:
+                continue
+            if name.endswith('_thumb.jpg'):
+                thumbnail = entry
+            elif media is None or entry.stat().st_mtime > media.stat().st_mtime:
+                media = entry
+
+    if media is None:
+        return None
+
+    st = media.stat()
+    metadata = MediaMetadata(
+        shortcode=shortcode,
+        size_bytes=st.st_size,
+        download_timestamp=datetime.fromtimestamp(st.st_mtime, timezone.utc),
+    )
+    return Path(media.path), Path(thumbnail.path) if thumbnail else None, metadata
+
 
 class ReelsDownloader:
     """Production-grade Instagram media downloader with fallback strategies."""
@@ -66,11 +128,52 @@ class ReelsDownloader:
         if self.has_auth:
             self.base_ydl_opts['username'] = settings.instagram_username
             self.base_ydl_opts['password'] = settings.instagram_password
-            logger.info(f"Instagram authentication enabled for user: {settings.instagram_username}")
+            logger.info("Instagram authentication enabled for user: %s", settings.instagram_username)
         else:
             logger.info("No authentication - using proxy/embed methods for public content")
 
-    def download(self, shortcode: str) -> Tuple[Path, Optional[Path], MediaMetadata]:
+        # Reused yt-dlp instances, one set per worker thread (YoutubeDL is not thread-safe)
+        # Why: constructing YoutubeDL re-parses options and reloads extractors every call
+        self._ydl_local = threading.local()
+        self._ydl_instances: List[yt_dlp.YoutubeDL] = []
+        self._ydl_instances_lock = threading.Lock()
+
+        # Downloads currently running, keyed by shortcode
+        # Why: concurrent requests for the same post wait on one download instead of repeating it
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+        # Shared HTTP session for direct CDN fetches (thumbnails)
+        # Why: keep-alive connections skip a TCP+TLS handshake on every download
+        self._http = make_session()
+
+    def _get_ydl(self, kind: str, extra_opts: Dict[str, Any]) -> yt_dlp.YoutubeDL:
+        """Return this thread's long-lived YoutubeDL for `kind`, building it on first use."""
+        ydl = getattr(self._ydl_local, kind, None)
+        if ydl is None:
+            ydl = yt_dlp.YoutubeDL({**self.base_ydl_opts, **extra_opts})
+            setattr(self._ydl_local, kind, ydl)
+            with self._ydl_instances_lock:
+                self._ydl_instances.append(ydl)
+        return ydl
+
+    def close(self):
+        """Close pooled yt-dlp instances and the HTTP session."""
+        self._http.close()
+
+        with self._ydl_instances_lock:
+            instances, self._ydl_instances = self._ydl_instances, []
+            self._ydl_local = threading.local()
+
+        for ydl in instances:
+            try:
+                ydl.close()
+            except Exception as e:
+                logger.debug("Failed to close yt-dlp instance: %s", e)
+
+    def download(
+        self, shortcode: str, is_post: bool = False
+    ) -> Tuple[Path, Optional[Path], MediaMetadata]:
         """Download Instagram media using best available method.
 
         Strategy:
@@ -80,6 +183,8 @@ class ReelsDownloader:
 
         Args:
             shortcode: Instagram post shortcode (8-15 characters)
+            is_post: The URL was a /p/ post (only those can be single photos;
+                reels and IGTV skip the photo probe)
 
         Returns:
             Tuple of (media_path, thumbnail_path, metadata)
@@ -90,25 +195,66 @@ class ReelsDownloader:
             RateLimitExceededError: Instagram rate limiting detected
             DownloadFailedError: All download methods failed
         """
+        with self._inflight_lock:
+            future = self._inflight.get(shortcode)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[shortcode] = future
+
+        if not is_owner:
+            logger.info("Download already in progress for %s, waiting for it", shortcode)
+            return future.result()
+
+        try:
+            result = self._download(shortcode, is_post)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                del self._inflight[shortcode]
+
+    def _download(self, shortcode: str, is_post: bool) -> Tuple[Path, Optional[Path], MediaMetadata]:
+        """Run the download strategies for a shortcode (see download())."""
         target_dir = settings.download_dir / shortcode
         target_dir.mkdir(parents=True, exist_ok=True)
 
-        logger.info(f"Starting download for shortcode: {shortcode}")
+        logger.info("Starting download for shortcode: %s", shortcode)
+
+        # One clock read per download: file names and metadata share the same moment
+        downloaded_at = datetime.now(timezone.utc)
+        date_str = downloaded_at.astimezone().strftime('%Y-%m-%d')  # Local date for file names
+
+        # Public single photos gain nothing from yt-dlp; go straight to the cheap proxy path.
+        # The probe's embed data is kept by the proxy client, so the proxy step reuses it
+        proxy_first = is_post and self.has_auth and self._is_public_photo(shortcode)
 
         # Strategy 1: Try yt-dlp with auth first (BEST QUALITY)
-        if self.has_auth:
+        if self.has_auth and not proxy_first:
             try:
                 logger.info("Trying yt-dlp with authentication...")
-                return self._download_via_ytdlp(shortcode, target_dir)
+                return self._download_via_ytdlp(shortcode, target_dir, date_str, downloaded_at)
             except Exception as e:
-                logger.warning(f"yt-dlp method failed: {e}")
+                logger.warning("yt-dlp method failed: %s", e)
 
         # Strategy 2: Fallback to proxy/embed method (NO AUTH REQUIRED)
         try:
             logger.info("Trying proxy/embed method (no authentication)...")
-            return self._download_via_proxy(shortcode, target_dir)
+            return self._download_via_proxy(shortcode, target_dir, date_str, downloaded_at)
         except Exception as e:
-            logger.warning(f"Proxy method failed: {e}")
+            logger.warning("Proxy method failed: %s", e)
+
+        # Proxy fast path failed - still give yt-dlp its chance
+        if proxy_first:
+            try:
+                logger.info("Trying yt-dlp with authentication...")
+                return self._download_via_ytdlp(shortcode, target_dir, date_str, downloaded_at)
+            except Exception as e:
+                logger.warning("yt-dlp method failed: %s", e)
 
         # All methods failed
         raise DownloadFailedError(
@@ -116,12 +262,106 @@ class ReelsDownloader:
             details={"shortcode": shortcode}
         )
 
-    def _download_via_proxy(self, shortcode: str, target_dir: Path) -> Tuple[Path, Optional[Path], MediaMetadata]:
+    def prescan_existing(
+        self, shortcodes: Iterable[str]
+    ) -> Dict[str, Tuple[Path, Optional[Path], MediaMetadata]]:
+        """Find which shortcodes already have a completed download on disk.
+
+        Scans the download directory once, then each matching shortcode
+        directory once (in parallel), instead of probing per shortcode.
+
+        Args:
+            shortcodes: Instagram post shortcodes
+
+        Returns:
+            Mapping of shortcode to (media_path, thumbnail_path, metadata) for
+            shortcodes with existing media; metadata carries size and file time only
+        """
+        wanted = set(shortcodes)
+        try:
+            with os.scandir(settings.download_dir) as entries:
+                dirs = [entry.path for entry in entries if entry.name in wanted and entry.is_dir()]
+        except FileNotFoundError:
+            return {}
+
+        if not dirs:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=min(16, len(dirs))) as pool:
+            found = list(pool.map(_scan_download_dir, dirs))
+
+        return {result[2].shortcode: result for result in found if result is not None}
+
+    def _is_public_photo(self, shortcode: str) -> bool:
+        """Return True if the embed page's structured data shows a public single-photo post.
+
+        An inconclusive probe returns False, leaving the post to yt-dlp.
+        """
+        try:
+            probe = self.proxy_downloader.quick_probe(shortcode)
+        except Exception as e:
+            logger.debug("Quick probe failed for %s: %s", shortcode, e)
+            return False
+
+        is_photo = bool(probe and probe['public'] and probe['type'] == 'photo')
+        if is_photo:
+            logger.info("Public photo detected for %s, skipping yt-dlp", shortcode)
+        return is_photo
+
+    async def download_many(
+        self,
+        shortcodes: List[str],
+        concurrency: int = 8,
+        jitter: Tuple[float, float] = (0.2, 1.0),
+        skip_existing: bool = True,
+    ) -> List[Union[Tuple[Path, Optional[Path], MediaMetadata], Exception]]:
+        """Download several posts concurrently.
+
+        Each download runs in a worker thread; a semaphore bounds how many run
+        at once and a small random delay spreads requests out to stay under
+        Instagram's rate limits.
+
+        Args:
+            shortcodes: Instagram post shortcodes
+            concurrency: Maximum simultaneous downloads
+            jitter: (min, max) seconds of random delay before each download
+            skip_existing: Return media already on disk instead of downloading again
+
+        Returns:
+            One entry per shortcode, in order: the download() result tuple, or
+            the exception raised for that shortcode (one failure does not
+            cancel the batch)
+        """
+        existing = await asyncio.to_thread(self.prescan_existing, shortcodes) if skip_existing else {}
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _download_one(shortcode: str):
+            if shortcode in existing:
+                return existing[shortcode]
+
+            async with semaphore:
+                await asyncio.sleep(random.uniform(*jitter))
+                return await asyncio.to_thread(self.download, shortcode)
+
+        return await asyncio.gather(
+            *(_download_one(shortcode) for shortcode in shortcodes),
+            return_exceptions=True,
+        )
+
+    def _download_via_proxy(
+        self,
+        shortcode: str,
+        target_dir: Path,
+        date_str: str,
+        downloaded_at: datetime,
+    ) -> Tuple[Path, Optional[Path], MediaMetadata]:
         """Download using proxy/embed method (no authentication).
 
         Args:
             shortcode: Post shortcode
             target_dir: Target directory
+            date_str: Date prefix for file names (YYYY-MM-DD)
+            downloaded_at: Download timestamp recorded in metadata
 
         Returns:
             Tuple of (media_path, thumbnail_path, metadata)
@@ -153,13 +393,14 @@ class ReelsDownloader:
             is_video = False
 
         # Create filename
-        date_str = datetime.now().strftime('%Y-%m-%d')
         media_filename = f"{date_str}_{shortcode}.{ext}"
         media_path = target_dir / media_filename
 
-        # Download media
-        logger.info(f"Downloading from CDN: {main_url[:80]}...")
-        self.proxy_downloader.download_media(main_url, str(media_path))
+        # Download media; oversized files are aborted from Content-Length or mid-stream
+        logger.info("Downloading from CDN: %.80s...", main_url)
+        self.proxy_downloader.download_media(
+            main_url, str(media_path), max_bytes=settings.max_file_size_mb * 1024 * 1024
+        )
 
         # Download thumbnail if available (second URL is usually thumbnail)
         thumbnail_path = None
@@ -171,7 +412,7 @@ class ReelsDownloader:
             try:
                 self.proxy_downloader.download_media(thumb_url, str(thumbnail_path))
             except Exception as e:
-                logger.warning(f"Failed to download thumbnail: {e}")
+                logger.warning("Failed to download thumbnail: %s", e)
                 thumbnail_path = None
 
         # Build metadata
@@ -180,19 +421,27 @@ class ReelsDownloader:
             duration_seconds=None,
             width=None,
             height=None,
-            size_bytes=media_path.stat().st_size if media_path.exists() else None,
-            download_timestamp=datetime.utcnow(),
+            size_bytes=_file_size(media_path),
+            download_timestamp=downloaded_at,
         )
 
-        logger.info(f"Proxy download successful: {media_path}")
+        logger.info("Proxy download successful: %s", media_path)
         return media_path, thumbnail_path, metadata
 
-    def _download_via_ytdlp(self, shortcode: str, target_dir: Path) -> Tuple[Path, Optional[Path], MediaMetadata]:
+    def _download_via_ytdlp(
+        self,
+        shortcode: str,
+        target_dir: Path,
+        date_str: str,
+        downloaded_at: datetime,
+    ) -> Tuple[Path, Optional[Path], MediaMetadata]:
         """Download using yt-dlp (fallback method).
 
         Args:
             shortcode: Post shortcode
             target_dir: Target directory
+            date_str: Date prefix for file names (YYYY-MM-DD)
+            downloaded_at: Download timestamp recorded in metadata
 
         Returns:
             Tuple of (media_path, thumbnail_path, metadata)
@@ -200,83 +449,81 @@ class ReelsDownloader:
         url = f"https://www.instagram.com/p/{shortcode}/"
 
         try:
-            logger.info(f"Fetching Instagram content for shortcode: {shortcode}")
+            logger.info("Fetching Instagram content for shortcode: %s", shortcode)
 
-            # First, extract metadata without downloading
-            info = self._extract_info(url)
+            # Extract metadata and download the media in a single yt-dlp pass
+            media_path, info = self._download_media(url, target_dir, shortcode, date_str)
 
             # Determine media type
             is_video = info.get('ext') in ['mp4', 'webm', 'mov'] or info.get('vcodec') != 'none'
             media_type = "video" if is_video else "photo"
-            logger.info(f"Detected media type: {media_type} for shortcode: {shortcode}")
-
-            # Download the media
-            media_path = self._download_media(url, target_dir, shortcode, info)
+            logger.info("Detected media type: %s for shortcode: %s", media_type, shortcode)
 
             # Extract thumbnail if video
             thumbnail_path = None
             if is_video:
-                thumbnail_path = self._download_thumbnail(info, target_dir, shortcode)
+                thumbnail_path = self._download_thumbnail(info, target_dir, shortcode, date_str)
 
             # Build metadata
+            duration = info.get('duration')
             metadata = MediaMetadata(
                 shortcode=shortcode,
-                duration_seconds=int(info.get('duration', 0)) if info.get('duration') else None,
+                duration_seconds=int(duration) if duration else None,
                 width=info.get('width'),
                 height=info.get('height'),
-                size_bytes=media_path.stat().st_size if media_path.exists() else None,
-                download_timestamp=datetime.utcnow(),
+                size_bytes=_file_size(media_path),
+                download_timestamp=downloaded_at,
             )
 
             # Extract and save text metadata if enabled
             if settings.save_metadata:
                 try:
-                    logger.info(f"Extracting text metadata for {shortcode}")
+                    logger.info("Extracting text metadata for %s", shortcode)
                     text_metadata = InstagramMetadataExtractor.extract_from_ytdlp(info, shortcode)
                     MetadataStorage.save_metadata(shortcode, text_metadata)
                 except Exception as e:
-                    logger.warning(f"Failed to save text metadata: {e}")
+                    logger.warning("Failed to save text metadata: %s", e)
 
-            logger.info(f"Download completed successfully: {shortcode} ({media_type})")
+            logger.info("Download completed successfully: %s (%s)", shortcode, media_type)
             return media_path, thumbnail_path, metadata
 
         except yt_dlp.utils.DownloadError as e:
-            error_msg = str(e).lower()
+            error_msg = str(e)
+            kind = next(
+                (name for name, pattern in _YTDLP_ERROR_PATTERNS if pattern.search(error_msg)),
+                None,
+            )
 
-            # Private account detection
-            if 'private' in error_msg or 'unavailable' in error_msg:
-                logger.warning(f"Private account or unavailable content: {shortcode}")
+            if kind == 'private':
+                logger.warning("Private account or unavailable content: %s", shortcode)
                 raise PrivateAccountError(
                     f"Content is private or unavailable",
-                    details={"shortcode": shortcode, "error": str(e)}
+                    details={"shortcode": shortcode, "error": error_msg}
                 )
 
-            # Content not found
-            if '404' in error_msg or 'not found' in error_msg or 'removed' in error_msg:
-                logger.warning(f"Content not found: {shortcode}")
+            if kind == 'not_found':
+                logger.warning("Content not found: %s", shortcode)
                 raise ContentNotFoundError(
                     "Content does not exist or has been deleted",
                     details={"shortcode": shortcode}
                 )
 
-            # Rate limiting detection
-            if '429' in error_msg or 'too many requests' in error_msg or 'rate limit' in error_msg:
-                logger.warning(f"Rate limit detected for {shortcode}")
+            if kind == 'rate_limit':
+                logger.warning("Rate limit detected for %s", shortcode)
                 raise RateLimitExceededError(
                     "Instagram rate limit exceeded, retry later",
                     details={"shortcode": shortcode, "retry_after_seconds": 300}
                 )
 
-            # API changes or other errors
-            if 'http error' in error_msg or 'unable to extract' in error_msg:
-                logger.error(f"Possible Instagram API change: {error_msg}")
+            if kind == 'api_change':
+                logger.error("Possible Instagram API change: %s", error_msg)
                 raise InstagramAPIError(
                     "Instagram may have changed their structure",
                     details={"shortcode": shortcode, "error": error_msg}
                 )
 
             # Generic download failure
-            logger.error(f"Download failed for {shortcode}: {error_msg}")
+            logger.error("Download failed for %s: %s", shortcode, error_msg)
             raise DownloadFailedError(
                 f"Failed to download content: {error_msg}",
                 details={"shortcode": shortcode}
@@ -284,95 +531,82 @@ class ReelsDownloader:
 
         except Exception as e:
             # Catch-all for unexpected errors
-            logger.exception(f"Unexpected error downloading {shortcode}")
+            logger.exception("Unexpected error downloading %s", shortcode)
             raise DownloadFailedError(
                 f"Unexpected error during download: {str(e)}",
                 details={"shortcode": shortcode, "error_type": type(e).__name__}
             )
 
-    def _extract_info(self, url: str) -> Dict[str, Any]:
-        """Extract metadata from Instagram URL without downloading.
-
-        Returns:
-            Dictionary with video/photo information
-        """
-        ydl_opts = {
-            **self.base_ydl_opts,
-            'skip_download': True,  # Only extract info
-        }
-
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            return ydl.extract_info(url, download=False)
-
     def _download_media(
         self,
         url: str,
         target_dir: Path,
         shortcode: str,
-        info: Dict[str, Any]
-    ) -> Path:
-        """Download the actual media file (video or photo).
+        date_str: str
+    ) -> Tuple[Path, Dict[str, Any]]:
+        """Extract metadata and download the media file (video or photo) in one pass.
 
         Returns:
-            Path to downloaded media file
+            Tuple of (path to downloaded media file, yt-dlp info dict)
         """
         # Configure output template to include date and shortcode
-        date_str = datetime.now().strftime('%Y-%m-%d')
         output_template = str(target_dir / f"{date_str}_{shortcode}.%(ext)s")
 
-        ydl_opts = {
-            **self.base_ydl_opts,
-            'outtmpl': output_template,
-            'format': 'best',  # Download best quality
-        }
+        # Best quality under the size cap (unknown sizes allowed), else best overall
+        ydl = self._get_ydl('download', {
+            'format': f"best[filesize<?{settings.max_file_size_mb}M]/best",
+            'progress_hooks': [self._on_ydl_progress],
+        })
+        # yt-dlp normalizes outtmpl into a dict at construction; swap the default per call
+        ydl.params['outtmpl']['default'] = output_template
+
+        logger.info("Downloading media to %s", target_dir)
+        self._ydl_local.finished_path = None
+        info = ydl.extract_info(url, download=True)
+
+        # yt-dlp reports where it wrote the file: the final path after
+        # post-processing, else the path from the 'finished' progress event
+        requested = info.get('requested_downloads') or [{}]
+        filepath = requested[0].get('filepath') or self._ydl_local.finished_path
+        if not filepath or not os.path.isfile(filepath):
+            raise DownloadFailedError(
+                "Media file not found after download",
+                details={"directory": str(target_dir), "shortcode": shortcode}
+            )
 
-        logger.info(f"Downloading media to {target_dir}")
-
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([url])
-
-        # Find the downloaded file
-        # yt-dlp will use the extension from the video (.mp4, .jpg, etc.)
-        possible_extensions = ['mp4', 'webm', 'mov', 'jpg', 'jpeg', 'png']
-        for ext in possible_extensions:
-            media_file = target_dir / f"{date_str}_{shortcode}.{ext}"
-            if media_file.exists():
-                # Check file size
-                file_size_mb = media_file.stat().st_size / (1024 * 1024)
-                if file_size_mb > settings.max_file_size_mb:
-                    media_file.unlink()  # Delete oversized file
-                    raise DownloadFailedError(
-                        f"File size ({file_size_mb:.1f}MB) exceeds limit ({settings.max_file_size_mb}MB)",
-                        details={"file_size_mb": file_size_mb, "limit_mb": settings.max_file_size_mb}
-                    )
-                logger.info(f"Media file found: {media_file} ({file_size_mb:.1f}MB)")
-                return media_file
-
-        # If not found with expected naming, search directory
-        media_files = list(target_dir.glob(f"*{shortcode}*"))
-        if media_files:
-            media_file = media_files[0]
-            # Check file size
-            file_size_mb = media_file.stat().st_size / (1024 * 1024)
-            if file_size_mb > settings.max_file_size_mb:
-                media_file.unlink()  # Delete oversized file
-                raise DownloadFailedError(
-                    f"File size ({file_size_mb:.1f}MB) exceeds limit ({settings.max_file_size_mb}MB)",
-                    details={"file_size_mb": file_size_mb, "limit_mb": settings.max_file_size_mb}
-                )
-            logger.warning(f"Using alternative file: {media_file} ({file_size_mb:.1f}MB)")
-            return media_file
+        return self._check_media_size(Path(filepath)), info
 
-        raise DownloadFailedError(
-            "Media file not found after download",
-            details={"directory": str(target_dir), "shortcode": shortcode}
-        )
+    def _on_ydl_progress(self, status: Dict[str, Any]) -> None:
+        """yt-dlp progress hook: remember this thread's finished download path."""
+        if status.get('status') == 'finished':
+            self._ydl_local.finished_path = status.get('filename')
+
+    def _check_media_size(self, media_file: Path) -> Path:
+        """Reject (and delete) media files over the configured size limit.
+
+        Returns:
+            media_file, if within the limit
+
+        Raises:
+            DownloadFailedError: File exceeds settings.max_file_size_mb
+        """
+        file_size_mb = media_file.stat().st_size / (1024 * 1024)
+        if file_size_mb > settings.max_file_size_mb:
+            media_file.unlink()  # Delete oversized file
+            raise DownloadFailedError(
+                f"File size ({file_size_mb:.1f}MB) exceeds limit ({settings.max_file_size_mb}MB)",
+                details={"file_size_mb": file_size_mb, "limit_mb": settings.max_file_size_mb}
+            )
+
+        logger.info("Media file found: %s (%.1fMB)", media_file, file_size_mb)
+        return media_file
 
     def _download_thumbnail(
         self,
         info: Dict[str, Any],
         target_dir: Path,
-        shortcode: str
+        shortcode: str,
+        date_str: str
     ) -> Optional[Path]:
         """Download thumbnail for video content.
 
@@ -381,30 +615,38 @@ class ReelsDownloader:
         """
         thumbnail_url = info.get('thumbnail')
         if not thumbnail_url:
-            logger.debug(f"No thumbnail available for {shortcode}")
+            logger.debug("No thumbnail available for %s", shortcode)
             return None
 
         try:
-            import requests
-            from io import BytesIO
-            from PIL import Image
-
-            # Download thumbnail
-            response = requests.get(thumbnail_url, timeout=10)
-            response.raise_for_status()
-
             # Save as JPG
-            date_str = datetime.now().strftime('%Y-%m-%d')
             thumbnail_path = target_dir / f"{date_str}_{shortcode}_thumb.jpg"
+            raw_path = thumbnail_path.with_suffix('.part')
+
+            # Stream thumbnail to disk instead of buffering the whole body in memory
+            with self._http.get(thumbnail_url, stream=True, timeout=10) as response:
+                response.raise_for_status()
+                with open(raw_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        f.write(chunk)
+
+            # Instagram's CDN usually serves JPEG already - keep those bytes as-is
+            with open(raw_path, 'rb') as f:
+                is_jpeg = f.read(3) == JPEG_MAGIC
+
+            if is_jpeg:
+                os.replace(raw_path, thumbnail_path)
+            else:
+                # Convert to JPG (WebP/PNG sources)
+                try:
+                    with Image.open(raw_path) as img:
+                        img.convert('RGB').save(thumbnail_path, 'JPEG', quality=90)  # Ensure RGB mode
+                finally:
+                    raw_path.unlink(missing_ok=True)
 
-            # Convert to JPG if needed
-            img = Image.open(BytesIO(response.content))
-            img = img.convert('RGB')  # Ensure RGB mode
-            img.save(thumbnail_path, 'JPEG', quality=90)
-
-            logger.info(f"Thumbnail saved: {thumbnail_path}")
+            logger.info("Thumbnail saved: %s", thumbnail_path)
             return thumbnail_path
 
         except Exception as e:
-            logger.warning(f"Failed to download thumbnail: {e}")
+            logger.warning("Failed to download thumbnail: %s", e)
             return None
@@ -4,13 +4,20 @@ Instaloader provides better carousel support and authentication handling.
 This downloader is used when Instagram credentials are provided.
 """
 
+import asyncio
 import logging
+import random
+import re
 import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple, List
-from datetime import datetime
+from typing import Optional, Tuple, List, Union
+from datetime import datetime, timedelta, timezone
 
 import instaloader
+import requests
 
 from app.config import settings
 from app.exceptions import (
@@ -20,10 +27,40 @@ from app.exceptions import (
     DownloadFailedError,
     InstagramAPIError,
 )
+from app.http_client import COPY_BUFFER_SIZE, make_adapter, make_session
 from app.models import MediaMetadata
 
 logger = logging.getLogger(__name__)
 
+# ConnectionException text classifiers, checked in order (first match wins)
+_CONNECTION_ERROR_PATTERNS = (
+    ('unauthorized', re.compile(r'401|unauthorized', re.I)),
+    ('not_found', re.compile(r'404|not found', re.I)),
+)
+
+# Maximum concurrent slide downloads per carousel
+CAROUSEL_WORKERS = 8
+
+
+# (local date string, epoch seconds of the next local midnight)
+_today_cache: Tuple[str, float] = ("", 0.0)
+
+
+def _today_str() -> str:
+    """Return today's local date (YYYY-MM-DD) for file names.
+
+    Why: the value changes once a day; format it once and reuse it until midnight.
+    """
+    global _today_cache
+    date_str, expires_at = _today_cache
+    now = time.time()
+    if now >= expires_at:
+        today = datetime.fromtimestamp(now)
+        date_str = today.strftime('%Y-%m-%d')
+        midnight = (today + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        _today_cache = (date_str, midnight.timestamp())
+    return date_str
+
 
 class InstaloaderDownloader:
     """Instagram downloader using Instaloader with authentication support."""
@@ -48,23 +85,94 @@ class InstaloaderDownloader:
         # Set custom user agent to avoid bot detection
         self.loader.context.user_agent = settings.user_agent
 
+        # Shared keep-alive session for CDN media fetches
+        # Why: Instaloader's get_raw opens a fresh session (new TCP+TLS) for every file
+        self._media_session = make_session()
+        self._media_session.headers['User-Agent'] = settings.user_agent
+        self._tune_session()
+
         # Login if credentials are provided
         # Why: Enables carousel download and private content access
+        self.is_logged_in = False
+        self._login_done = threading.Event()
         if settings.instagram_username and settings.instagram_password:
-            try:
-                logger.info(f"Attempting Instagram login as: {settings.instagram_username}")
-                self.loader.login(
-                    settings.instagram_username,
-                    settings.instagram_password
-                )
-                logger.info(f"Instagram login successful: {settings.instagram_username}")
-                self.is_logged_in = True
-            except Exception as e:
-                logger.warning(f"Instagram login failed: {e}. Continuing without login.")
-                self.is_logged_in = False
+            # Log in on a background thread so construction doesn't block on
+            # several round trips; download() waits for it to finish
+            threading.Thread(
+                target=self._background_login,
+                name="instaloader-login",
+                daemon=True,
+            ).start()
         else:
             logger.info("No Instagram credentials provided - carousel support disabled")
-            self.is_logged_in = False
+            self._login_done.set()
+
+    def _background_login(self):
+        """Restore or create the Instagram session, then signal waiting downloads."""
+        try:
+            self.is_logged_in = self._restore_session() or self._login()
+            # Loading or creating a session replaces the context's requests.Session
+            self._tune_session()
+        finally:
+            self._login_done.set()
+
+    def _tune_session(self):
+        """Mount the shared pooled, 5xx-retrying adapter on Instaloader's session.
+
+        429 is not retried there: Instaloader's RateController already backs off on it.
+        """
+        self.loader.context._session.mount('https://', make_adapter())
+
+    def _restore_session(self) -> bool:
+        """Reuse the Instagram session saved by a previous login.
+
+        Why: a full login is several round trips and hits Instagram's login
+        rate limit when workers restart; a saved session needs one check.
+
+        Returns:
+            True if a saved session was loaded and is still valid
+        """
+        username = settings.instagram_username
+        try:
+            self.loader.load_session_from_file(username, filename=str(settings.instagram_session_file))
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning("Could not load saved Instagram session: %s", e)
+            return False
+
+        try:
+            if self.loader.test_login() == username:
+                logger.info("Reusing saved Instagram session for: %s", username)
+                return True
+        except Exception as e:
+            logger.warning("Saved Instagram session check failed: %s", e)
+
+        logger.info("Saved Instagram session expired - logging in again")
+        return False
+
+    def _login(self) -> bool:
+        """Log in with the configured credentials and save the session for reuse.
+
+        Returns:
+            True if login succeeded
+        """
+        try:
+            logger.info("Attempting Instagram login as: %s", settings.instagram_username)
+            self.loader.login(
+                settings.instagram_username,
+                settings.instagram_password
+            )
+            logger.info("Instagram login successful: %s", settings.instagram_username)
+        except Exception as e:
+            logger.warning("Instagram login failed: %s. Continuing without login.", e)
+            return False
+
+        try:
+            self.loader.save_session_to_file(filename=str(settings.instagram_session_file))
+        except OSError as e:
+            logger.warning("Could not save Instagram session: %s", e)
+        return True
 
     def download(self, shortcode: str) -> Tuple[List[Path], Optional[Path], MediaMetadata]:
         """Download Instagram media using Instaloader.
@@ -87,49 +195,53 @@ class InstaloaderDownloader:
         target_dir = settings.download_dir / shortcode
         target_dir.mkdir(parents=True, exist_ok=True)
 
+        # Use the logged-in session if login is still in progress
+        self._login_done.wait()
+
         try:
-            logger.info(f"Fetching Instagram content with Instaloader: {shortcode}")
+            logger.info("Fetching Instagram content with Instaloader: %s", shortcode)
 
             # Get post object from Instagram
             # Why: Instaloader handles authentication and rate limiting automatically
             post = instaloader.Post.from_shortcode(self.loader.context, shortcode)
 
-            # Download the post
-            # Why: Instaloader downloads all media in carousel automatically
-            logger.info(f"Downloading post: {shortcode}")
-            self.loader.download_post(post, target=str(target_dir))
-
-            # Determine media type and find downloaded files
+            # Determine media type
             is_carousel = post.typename == 'GraphSidecar'
             is_video = post.is_video
+            date_str = _today_str()
 
+            # Media is fetched straight to its final name
+            # Why: download_post writes extra files under Instaloader's own naming
+            # that we then had to find, rename and clean up
+            thumbnail_path = None
             if is_carousel:
                 media_type = "carousel"
-                logger.info(f"Detected carousel with {post.mediacount} items")
+                logger.info("Detected carousel with %d items", post.mediacount)
+
+                # Fetch slides in parallel
+                # Why: slides are independent CDN files; fetching one by one pays a round trip each
+                media_paths, size_bytes = self._download_carousel(post, target_dir, shortcode, date_str)
             elif is_video:
                 media_type = "video"
-                logger.info(f"Detected single video")
+                logger.info("Detected single video")
+
+                media_path = target_dir / f"{date_str}_{shortcode}.mp4"
+                size_bytes = self._fetch_to_file(post.video_url, media_path)
+                media_paths = [media_path]
+
+                thumbnail_path = target_dir / f"{date_str}_{shortcode}_thumb.jpg"
+                try:
+                    self._fetch_to_file(post.url, thumbnail_path)
+                except requests.RequestException as e:
+                    logger.warning("Failed to download thumbnail: %s", e)
+                    thumbnail_path = None
             else:
                 media_type = "photo"
-                logger.info(f"Detected single photo")
+                logger.info("Detected single photo")
 
-            # Find and organize downloaded files
-            # Why: Instaloader creates multiple files, we need to find the actual media
-            media_paths = self._find_media_files(target_dir, shortcode)
-
-            if not media_paths:
-                raise DownloadFailedError(
-                    "No media files found after download",
-                    details={"directory": str(target_dir), "shortcode": shortcode}
-                )
-
-            # Rename files to simple format: 2025-11-04_{shortcode}_1.jpg, etc.
-            media_paths = self._rename_media_files(media_paths, target_dir, shortcode)
-
-            # Find thumbnail for videos
-            thumbnail_path = None
-            if is_video and not is_carousel:
-                thumbnail_path = self._find_thumbnail_file(target_dir, shortcode)
+                media_path = target_dir / f"{date_str}_{shortcode}.jpg"
+                size_bytes = self._fetch_to_file(post.url, media_path)
+                media_paths = [media_path]
 
             # Build metadata
             metadata = MediaMetadata(
@@ -137,54 +249,58 @@ class InstaloaderDownloader:
                 duration_seconds=post.video_duration if is_video else None,
                 width=None,  # Instaloader doesn't provide dimensions directly
                 height=None,
-                size_bytes=sum(p.stat().st_size for p in media_paths) if media_paths else None,
-                download_timestamp=datetime.utcnow(),
+                size_bytes=size_bytes,  # Counted while writing, no stat() needed
+                download_timestamp=datetime.now(timezone.utc),
             )
 
-            logger.info(f"Download completed: {shortcode} ({media_type}, {len(media_paths)} files)")
+            logger.info("Download completed: %s (%s, %d files)", shortcode, media_type, len(media_paths))
             return media_paths, thumbnail_path, metadata
 
         except instaloader.exceptions.ProfileNotExistsException:
-            logger.warning(f"Content not found: {shortcode}")
+            logger.warning("Content not found: %s", shortcode)
             raise ContentNotFoundError(
                 "Content does not exist or has been deleted",
                 details={"shortcode": shortcode}
             )
 
         except instaloader.exceptions.PrivateProfileNotFollowedException:
-            logger.warning(f"Private account: {shortcode}")
+            logger.warning("Private account: %s", shortcode)
             raise PrivateAccountError(
                 "Content is from a private account",
                 details={"shortcode": shortcode}
             )
 
         except instaloader.exceptions.TooManyRequestsException:
-            logger.warning(f"Rate limit detected for {shortcode}")
+            logger.warning("Rate limit detected for %s", shortcode)
             raise RateLimitExceededError(
                 "Instagram rate limit exceeded, retry later",
                 details={"shortcode": shortcode, "retry_after_seconds": 300}
             )
 
         except instaloader.exceptions.ConnectionException as e:
-            error_msg = str(e).lower()
+            error_msg = str(e)
+            kind = next(
+                (name for name, pattern in _CONNECTION_ERROR_PATTERNS if pattern.search(error_msg)),
+                None,
+            )
 
             # Check for specific error types
-            if '401' in error_msg or 'unauthorized' in error_msg:
-                logger.error(f"Instagram API 401 error: {error_msg}")
+            if kind == 'unauthorized':
+                logger.error("Instagram API 401 error: %s", error_msg)
                 raise InstagramAPIError(
                     "Instagram authentication required or API changed",
                     details={"shortcode": shortcode, "error": error_msg}
                 )
 
-            if '404' in error_msg or 'not found' in error_msg:
-                logger.warning(f"Content not found: {shortcode}")
+            if kind == 'not_found':
+                logger.warning("Content not found: %s", shortcode)
                 raise ContentNotFoundError(
                     "Content does not exist or has been deleted",
                     details={"shortcode": shortcode}
                 )
 
             # Generic connection error
-            logger.error(f"Connection error downloading {shortcode}: {error_msg}")
+            logger.error("Connection error downloading %s: %s", shortcode, error_msg)
             raise DownloadFailedError(
                 f"Connection error: {error_msg}",
                 details={"shortcode": shortcode}
@@ -192,79 +308,108 @@ class InstaloaderDownloader:
 
         except Exception as e:
             # Catch-all for unexpected errors
-            logger.exception(f"Unexpected error downloading {shortcode}")
+            logger.exception("Unexpected error downloading %s", shortcode)
             raise DownloadFailedError(
                 f"Unexpected error during download: {str(e)}",
                 details={"shortcode": shortcode, "error_type": type(e).__name__}
             )
 
-    def _find_media_files(self, target_dir: Path, shortcode: str) -> List[Path]:
-        """Find all media files downloaded by Instaloader.
+    async def download_async(self, shortcode: str) -> Tuple[List[Path], Optional[Path], MediaMetadata]:
+        """Run download() in a worker thread so async callers don't block the event loop.
+
+        Args:
+            shortcode: Instagram post shortcode (11 characters)
+
+        Returns:
+            Same as download()
 
-        Why: Instaloader creates files with timestamp prefix, we need to find them.
+        Raises:
+            Same as download()
         """
-        # Instaloader creates files like: 2024-11-04_12-34-56_UTC.jpg
-        # Look for common image and video extensions
-        media_files = []
+        return await asyncio.to_thread(self.download, shortcode)
 
-        for ext in ['jpg', 'jpeg', 'png', 'mp4', 'webm', 'mov']:
-            files = list(target_dir.glob(f"*.{ext}"))
-            # Filter out thumbnails (contain '_thumb' in filename)
-            files = [f for f in files if '_thumb' not in f.name.lower()]
-            media_files.extend(files)
+    async def download_many(
+        self,
+        shortcodes: List[str],
+        concurrency: int = 4,
+        jitter: Tuple[float, float] = (0.2, 1.0),
+    ) -> List[Union[Tuple[List[Path], Optional[Path], MediaMetadata], Exception]]:
+        """Download several posts concurrently.
 
-        # Sort by creation time to maintain order
-        media_files.sort(key=lambda p: p.stat().st_ctime)
+        Each download runs in a worker thread; a semaphore bounds how many run
+        at once and a small random delay spreads requests out. The default
+        concurrency is lower than ReelsDownloader's because every post costs
+        an authenticated GraphQL request.
 
-        return media_files
+        Args:
+            shortcodes: Instagram post shortcodes
+            concurrency: Maximum simultaneous downloads
+            jitter: (min, max) seconds of random delay before each download
+
+        Returns:
+            One entry per shortcode, in order: the download() result tuple, or
+            the exception raised for that shortcode (one failure does not
+            cancel the batch)
+        """
+        semaphore = asyncio.Semaphore(concurrency)
 
-    def _find_thumbnail_file(self, target_dir: Path, shortcode: str) -> Optional[Path]:
-        """Find thumbnail file for video."""
-        # Look for files with 'thumb' in the name
-        thumb_files = list(target_dir.glob("*thumb*.jpg"))
-        return thumb_files[0] if thumb_files else None
+        async def _download_one(shortcode: str):
+            async with semaphore:
+                await asyncio.sleep(random.uniform(*jitter))
+                return await self.download_async(shortcode)
 
-    def _rename_media_files(self, media_paths: List[Path], target_dir: Path, shortcode: str) -> List[Path]:
-        """Rename media files to simple format.
+        return await asyncio.gather(
+            *(_download_one(shortcode) for shortcode in shortcodes),
+            return_exceptions=True,
+        )
+
+    def _download_carousel(
+        self,
+        post: instaloader.Post,
+        target_dir: Path,
+        shortcode: str,
+        date_str: str
+    ) -> Tuple[List[Path], int]:
+        """Download all carousel slides concurrently.
 
-        Why: Make file names predictable and easy to use.
-        Format: 2025-11-04_{shortcode}_1.jpg, 2025-11-04_{shortcode}_2.jpg, etc.
+        Files are written directly as 2025-11-04_{shortcode}_1.jpg, _2.mp4, etc.
+
+        Returns:
+            Tuple of (slide paths in carousel order, total bytes written)
         """
-        date_str = datetime.now().strftime('%Y-%m-%d')
-        renamed_paths = []
-
-        for idx, media_path in enumerate(media_paths, 1):
-            ext = media_path.suffix
-            if len(media_paths) == 1:
-                # Single file: 2025-11-04_{shortcode}.jpg
-                new_name = f"{date_str}_{shortcode}{ext}"
-            else:
-                # Multiple files: 2025-11-04_{shortcode}_1.jpg, etc.
-                new_name = f"{date_str}_{shortcode}_{idx}{ext}"
-
-            new_path = target_dir / new_name
-
-            # Only rename if different
-            if media_path != new_path:
-                # Remove destination if exists
-                if new_path.exists():
-                    new_path.unlink()
-                media_path.rename(new_path)
-                renamed_paths.append(new_path)
+        nodes = list(post.get_sidecar_nodes())
+        if not nodes:
+            raise DownloadFailedError(
+                "Carousel has no media items",
+                details={"shortcode": shortcode}
+            )
+
+        jobs = []
+        for idx, node in enumerate(nodes, 1):
+            if node.is_video:
+                url, ext = node.video_url, '.mp4'
             else:
-                renamed_paths.append(media_path)
+                url, ext = node.display_url, '.jpg'
+            jobs.append((url, target_dir / f"{date_str}_{shortcode}_{idx}{ext}"))
 
-        return renamed_paths
+        with ThreadPoolExecutor(max_workers=min(CAROUSEL_WORKERS, len(jobs))) as pool:
+            futures = [pool.submit(self._fetch_to_file, url, path) for url, path in jobs]
+            total_bytes = sum(future.result() for future in futures)  # Re-raises the first failure
 
-    def cleanup_temp_files(self, target_dir: Path):
-        """Clean up temporary files created by Instaloader.
+        return [path for _, path in jobs], total_bytes
 
-        Why: Instaloader creates extra metadata files we don't need.
-        """
-        # Remove .txt metadata files
-        for txt_file in target_dir.glob("*.txt"):
-            txt_file.unlink()
+    def _fetch_to_file(self, url: str, path: Path) -> int:
+        """Stream a CDN media URL to path over the shared keep-alive session.
 
-        # Remove .json.xz compressed metadata
-        for json_file in target_dir.glob("*.json*"):
-            json_file.unlink()
+        Returns:
+            Number of bytes written
+        """
+        total = 0
+        with self._media_session.get(url, stream=True, timeout=settings.request_timeout_seconds) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            read = response.raw.read
+            with open(path, 'wb') as f:
+                while chunk := read(COPY_BUFFER_SIZE):
+                    total += f.write(chunk)
+        return total
@@ -10,9 +10,11 @@ Design considerations:
 """
 
 import logging
+import os
+import re
 from pathlib import Path
 from typing import Optional, Tuple
-from datetime import datetime
+from datetime import datetime, timezone
 
 import instaloader
 from instaloader.exceptions import (
@@ -34,6 +36,21 @@ from app.models import MediaMetadata
 
 logger = logging.getLogger(__name__)
 
+# InstaloaderException text classifiers, checked in order (first match wins)
+_INSTALOADER_ERROR_PATTERNS = (
+    ('rate_limit', re.compile(r'429|too many requests', re.I)),
+    ('api_change', re.compile(r'json|graphql', re.I)),
+)
+
+
+def _find_file(directory: Path, shortcode: str, suffix: str) -> Optional[Path]:
+    """Return the first file in directory whose name contains shortcode and ends with suffix."""
+    with os.scandir(directory) as it:
+        for entry in it:
+            if shortcode in entry.name and entry.name.endswith(suffix):
+                return Path(entry.path)
+    return None
+
 
 class ReelsDownloader:
     """Production-grade Instagram Reels downloader with error handling."""
@@ -74,12 +91,12 @@ class ReelsDownloader:
             InstagramAPIError: Instagram API structure changed
         """
         try:
-            logger.info(f"Fetching post metadata for shortcode: {shortcode}")
+            logger.info("Fetching post metadata for shortcode: %s", shortcode)
             post = instaloader.Post.from_shortcode(self.loader.context, shortcode)
 
             # Log media type for debugging
             media_type = "video" if post.is_video else "photo"
-            logger.info(f"Detected media type: {media_type} for shortcode: {shortcode}")
+            logger.info("Detected media type: %s for shortcode: %s", media_type, shortcode)
 
             # Check if post is accessible (public account)
             if post.owner_profile.is_private:
@@ -92,7 +109,7 @@ class ReelsDownloader:
             target_dir = settings.download_dir / shortcode
             target_dir.mkdir(parents=True, exist_ok=True)
 
-            logger.info(f"Downloading {media_type} to {target_dir}")
+            logger.info("Downloading %s to %s", media_type, target_dir)
             self.loader.download_post(post, target=str(target_dir))
 
             # Locate downloaded files based on media type
@@ -111,48 +128,52 @@ class ReelsDownloader:
                 width=post.dimensions[0] if post.dimensions else None,
                 height=post.dimensions[1] if post.dimensions else None,
                 size_bytes=media_path.stat().st_size if media_path else None,
-                download_timestamp=datetime.utcnow(),
+                download_timestamp=datetime.now(timezone.utc),
             )
 
-            logger.info(f"Download completed successfully: {shortcode} ({media_type})")
+            logger.info("Download completed successfully: %s (%s)", shortcode, media_type)
             return media_path, thumbnail_path, metadata
 
         except LoginRequiredException as e:
             # This shouldn't happen for public posts, indicates API change
-            logger.error(f"Unexpected login requirement for public post: {shortcode}")
+            logger.error("Unexpected login requirement for public post: %s", shortcode)
             raise PrivateAccountError(
                 "Content requires authentication (private account or API change)",
                 details={"shortcode": shortcode, "original_error": str(e)}
             )
 
         except (ProfileNotExistsException, PostChangedException) as e:
-            logger.warning(f"Content not found: {shortcode} - {str(e)}")
+            logger.warning("Content not found: %s - %s", shortcode, e)
             raise ContentNotFoundError(
                 "Content does not exist or has been deleted",
                 details={"shortcode": shortcode}
             )
 
         except InstaloaderException as e:
-            error_msg = str(e).lower()
+            error_msg = str(e)
+            kind = next(
+                (name for name, pattern in _INSTALOADER_ERROR_PATTERNS if pattern.search(error_msg)),
+                None,
+            )
 
             # Detect rate limiting patterns
-            if "429" in error_msg or "too many requests" in error_msg:
-                logger.warning(f"Rate limit detected for {shortcode}")
+            if kind == 'rate_limit':
+                logger.warning("Rate limit detected for %s", shortcode)
                 raise RateLimitExceededError(
                     "Instagram rate limit exceeded, retry later",
                     details={"shortcode": shortcode, "retry_after_seconds": 300}
                 )
 
             # Detect API structure changes
-            if "json" in error_msg or "graphql" in error_msg:
-                logger.error(f"Possible Instagram API change: {error_msg}")
+            if kind == 'api_change':
+                logger.error("Possible Instagram API change: %s", error_msg)
                 raise InstagramAPIError(
                     "Instagram API structure may have changed",
                     details={"shortcode": shortcode, "error": error_msg}
                 )
 
             # Generic Instaloader failure
-            logger.error(f"Download failed for {shortcode}: {error_msg}")
+            logger.error("Download failed for %s: %s", shortcode, error_msg)
             raise DownloadFailedError(
                 f"Failed to download content: {error_msg}",
                 details={"shortcode": shortcode}
@@ -160,7 +181,7 @@ class ReelsDownloader:
 
         except Exception as e:
             # Catch-all for unexpected errors
-            logger.exception(f"Unexpected error downloading {shortcode}")
+            logger.exception("Unexpected error downloading %s", shortcode)
             raise DownloadFailedError(
                 f"Unexpected error during download: {str(e)}",
                 details={"shortcode": shortcode, "error_type": type(e).__name__}
@@ -171,14 +192,14 @@ class ReelsDownloader:
 
         Instaloader naming: {date}_{shortcode}.mp4
         """
-        video_files = list(directory.glob(f"*{shortcode}*.mp4"))
-        if not video_files:
-            logger.error(f"Video file not found in {directory}")
+        video_file = _find_file(directory, shortcode, '.mp4')
+        if video_file is None:
+            logger.error("Video file not found in %s", directory)
             raise DownloadFailedError(
                 "Video file not found after download",
                 details={"directory": str(directory), "shortcode": shortcode}
             )
-        return video_files[0]  # Return first match
+        return video_file
 
     def _find_thumbnail_file(self, directory: Path, shortcode: str) -> Optional[Path]:
         """Locate the thumbnail file in download directory.
@@ -186,8 +207,7 @@ class ReelsDownloader:
         Instaloader naming: {date}_{shortcode}.jpg
         For videos, this is the video thumbnail.
         """
-        thumbnail_files = list(directory.glob(f"*{shortcode}*.jpg"))
-        return thumbnail_files[0] if thumbnail_files else None
+        return _find_file(directory, shortcode, '.jpg')
 
     def _find_image_file(self, directory: Path, shortcode: str) -> Optional[Path]:
         """Locate the image file for photo posts.
@@ -195,11 +215,11 @@ class ReelsDownloader:
         Instaloader naming: {date}_{shortcode}.jpg
         For photos, this is the main image.
         """
-        image_files = list(directory.glob(f"*{shortcode}*.jpg"))
-        if not image_files:
-            logger.error(f"Image file not found in {directory}")
+        image_file = _find_file(directory, shortcode, '.jpg')
+        if image_file is None:
+            logger.error("Image file not found in %s", directory)
             raise DownloadFailedError(
                 "Image file not found after download",
                 details={"directory": str(directory), "shortcode": shortcode}
             )
-        return image_files[0]  # Return first match
+        return image_file
@@ -64,3 +64,11 @@ class AuthenticationError(ReelsDownloaderError):
     - Insufficient permissions
     """
     pass
+
+
+class ServerBusyError(ReelsDownloaderError):
+    """Raised when too many downloads are already queued on this server.
+
+    Client should retry after the delay in details["retry_after_seconds"].
+    """
+    pass
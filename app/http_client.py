@@ -0,0 +1,137 @@
+"""HTTP session helpers shared by the Instagram clients.
+
+The GraphQL client and the proxy downloader talk to the same Instagram and
+CDN hosts, so they share one definition of connection pooling and streaming
+buffer sizes here.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple, TypeVar, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+from app.config import settings
+from app.rate_limiter import HostRateLimiter
+
+# Keep-alive connections kept per host (instagram.com, the CDN hosts)
+# Why: urllib3's default of 10 makes concurrent gather_* calls discard and re-handshake connections
+HTTP_POOL_SIZE = 32
+
+# Buffer size for streaming CDN responses to disk
+COPY_BUFFER_SIZE = 1024 * 1024
+
+T = TypeVar('T')
+
+
+def make_adapter() -> HTTPAdapter:
+    """Build the pooled HTTPS adapter with retries for transient failures.
+
+    Why: transient 5xx and connection resets are retried with exponential
+    backoff here instead of failing the request; 429 is left to the caller
+    so rate limits surface with Instagram's own Retry-After (and Instaloader's
+    own back-off still sees them when mounted on its session).
+    """
+    return HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=HTTP_POOL_SIZE,
+        max_retries=Retry(
+            total=settings.max_retries,
+            backoff_factor=0.5,
+            status_forcelist=[500, 502, 503, 504],
+            allowed_methods=frozenset({'GET', 'HEAD'}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        ),
+    )
+
+
+def make_session() -> requests.Session:
+    """Build a requests session with the pooled, retrying adapter (see make_adapter).
+
+    Why: Accept-Encoding only advertises codings urllib3 can decode here
+    (br/zstd when the brotli/zstandard packages are installed); a hard-coded
+    "br" without them would hand back compressed bytes as the page body.
+    """
+    session = requests.Session()
+    session.mount('https://', make_adapter())
+    session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+    return session
+
+
+def rate_limited_get(
+    session: requests.Session,
+    limiter: HostRateLimiter,
+    url: str,
+    **kwargs,
+) -> requests.Response:
+    """GET an Instagram page/API URL through the shared per-host rate limiter."""
+    host = urlsplit(url).hostname or ''
+    limiter.acquire(host)
+    response = session.get(url, **kwargs)
+    limiter.observe(host, response.status_code, response.headers)
+    return response
+
+
+async def gather_unique(
+    fetch: Callable[[str], T],
+    shortcodes: List[str],
+    concurrency: int,
+) -> List[Union[T, Exception]]:
+    """Run a blocking per-shortcode fetch for a batch in worker threads.
+
+    Each distinct shortcode is fetched once; a semaphore caps how many
+    fetches are in flight.
+
+    Args:
+        fetch: Blocking function taking a shortcode
+        shortcodes: Instagram post shortcodes, possibly repeated
+        concurrency: Maximum simultaneous fetches
+
+    Returns:
+        One entry per shortcode, in order: fetch's result, or the exception
+        it raised for that shortcode
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _fetch_one(shortcode: str):
+        async with semaphore:
+            return await asyncio.to_thread(fetch, shortcode)
+
+    # Why: repeated shortcodes in one batch would otherwise race past the
+    # clients' result caches and each spend a request against Instagram's rate limit
+    unique = list(dict.fromkeys(shortcodes))
+    results = await asyncio.gather(
+        *(_fetch_one(shortcode) for shortcode in unique),
+        return_exceptions=True,
+    )
+    by_shortcode = dict(zip(unique, results))
+    return [by_shortcode[shortcode] for shortcode in shortcodes]
+
+
+def download_concurrently(
+    download: Callable[[str, str], None],
+    jobs: List[Tuple[str, str]],
+    max_workers: int = 8,
+) -> None:
+    """Run a blocking (URL, output path) download for several items concurrently.
+
+    Args:
+        download: A client's download_media method
+        jobs: (media URL, output path) pairs
+        max_workers: Maximum simultaneous downloads
+
+    Raises:
+        The first download error, after all downloads have finished
+    """
+    if not jobs:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as pool:
+        futures = [pool.submit(download, url, path) for url, path in jobs]
+        for future in futures:
+            future.result()
@@ -5,10 +5,16 @@ Supports videos, photos, and carousel posts.
 """
 
 import logging
+import re
+import shutil
 import requests
-from typing import Dict, Any, List, Optional
+from dataclasses import dataclass, fields
+from typing import Dict, Any, List, Optional, Tuple, Union
 from datetime import datetime
 
+import orjson
+
+from app.cache import TTLCache
 from app.config import settings
 from app.exceptions import (
     PrivateAccountError,
@@ -16,9 +22,118 @@ from app.exceptions import (
     RateLimitExceededError,
     InstagramAPIError,
 )
+from app.http_client import (
+    COPY_BUFFER_SIZE,
+    download_concurrently,
+    gather_unique,
+    make_session,
+    rate_limited_get,
+)
+from app.rate_limiter import HostRateLimiter, get_instagram_limiter, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
+# Markers that precede embedded post JSON, tried in order
+# Instagram embeds data in <script type="application/ld+json">
+# Why bytes: the page is scanned as raw response bytes, so only the JSON slice
+# is ever decoded (by orjson) instead of the whole ~1 MB page
+_EMBEDDED_JSON_MARKERS = (
+    b'<script type="application/ld+json">',
+    b'window._sharedData = ',
+    b'"xdt_api__v1__media__shortcode__web_info":',
+)
+
+# JSON string literals (skipped whole) or braces; safe on UTF-8 bytes because
+# multi-byte sequences never contain ASCII quote, backslash or brace bytes
+_JSON_SCAN_RE = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}]', re.DOTALL)
+
+
+def _find_json_object(html: bytes, marker: bytes) -> Optional[bytes]:
+    """Return the balanced JSON object that follows marker in html.
+
+    Why: non-greedy `{.*?}` regexes under DOTALL backtrack badly on large
+    pages and cut nested objects short; this is a single linear scan that
+    tracks brace depth and skips over string literals.
+
+    Args:
+        html: Raw HTML response body
+        marker: Bytes immediately preceding the object (whitespace allowed)
+
+    Returns:
+        The JSON object bytes, or None if the marker or a balanced object is missing
+    """
+    start = html.find(marker)
+    if start == -1:
+        return None
+
+    start += len(marker)
+    while html[start:start + 1].isspace():
+        start += 1
+    if not html.startswith(b'{', start):
+        return None
+
+    depth = 0
+    for match in _JSON_SCAN_RE.finditer(html, start):
+        token = match.group()
+        if token == b'{':
+            depth += 1
+        elif token == b'}':
+            depth -= 1
+            if depth == 0:
+                return html[start:match.end()]
+    return None
+
+
+def _conditional_headers(cached: Optional[tuple]) -> Dict[str, str]:
+    """Build If-None-Match / If-Modified-Since headers from a cached (ETag, Last-Modified, ...) entry."""
+    headers = {}
+    if cached is not None:
+        etag, last_modified = cached[0], cached[1]
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+    return headers
+
+
+def _retry_after_seconds(response: requests.Response, default: int = 300) -> int:
+    """Return the wait Instagram asked for in Retry-After (seconds or HTTP date), or default."""
+    seconds = parse_retry_after(response.headers.get('Retry-After'))
+    return default if seconds is None else int(seconds)
+
+
+@dataclass(frozen=True, slots=True)
+class PostData:
+    """Standardized public post data returned by InstagramGraphQL.get_post_data.
+
+    Frozen so results held in the client's caches can be shared between
+    callers without being mutated.
+    """
+
+    shortcode: str
+    typename: str
+    is_video: bool
+    is_carousel: bool
+    caption: str
+    timestamp: int
+    video_url: Optional[str]
+    display_url: Optional[str]
+    thumbnail_url: Optional[str]
+    carousel_items: Tuple[Dict[str, Any], ...]
+    width: Optional[int]
+    height: Optional[int]
+    likes: int
+    comments: int
+    views: Optional[int]
+    author: Dict[str, Any]
+    location: Optional[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the post as a plain dict (the format get_post_data used to return)."""
+        data = {field.name: getattr(self, field.name) for field in fields(self)}
+        data['carousel_items'] = list(self.carousel_items)
+        return data
+
 
 class InstagramGraphQL:
     """Instagram GraphQL API client for public posts."""
@@ -29,27 +144,38 @@ class InstagramGraphQL:
     # Web interface endpoint (fallback)
     WEB_URL = "https://www.instagram.com/p/{shortcode}/?__a=1&__d=dis"
 
-    def __init__(self):
-        """Initialize GraphQL client with browser-like headers."""
-        self.session = requests.Session()
+    def __init__(self, limiter: Optional[HostRateLimiter] = None):
+        """Initialize GraphQL client with browser-like headers.
+
+        Args:
+            limiter: Outbound rate limiter (defaults to the one shared by all Instagram clients)
+        """
+        self._limiter = limiter or get_instagram_limiter()
+        self.session = make_session()
         self.session.headers.update({
             'User-Agent': settings.user_agent,
             'Accept': '*/*',
             'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
             'X-Requested-With': 'XMLHttpRequest',
             'Referer': 'https://www.instagram.com/',
             'Origin': 'https://www.instagram.com',
         })
 
-    def get_post_data(self, shortcode: str) -> Dict[str, Any]:
+        # Post page URL -> (ETag, Last-Modified, parsed post data)
+        # Why: revalidating with a conditional GET lets Instagram answer 304 with no body to parse
+        self._validators = TTLCache(maxsize=1024, ttl_seconds=3600)
+
+        # Shortcode -> parsed post data; repeat lookups within 10 minutes skip the network entirely
+        self._posts = TTLCache(maxsize=1024, ttl_seconds=600)
+
+    def get_post_data(self, shortcode: str) -> PostData:
         """Fetch post data from Instagram's public API.
 
         Args:
             shortcode: Instagram post shortcode (8-15 characters)
 
         Returns:
-            Dictionary containing post metadata and media URLs
+            PostData with post metadata and media URLs
 
         Raises:
             ContentNotFoundError: Post doesn't exist or was deleted
@@ -57,22 +183,36 @@ class InstagramGraphQL:
             RateLimitExceededError: Instagram rate limiting detected
             InstagramAPIError: API structure changed or other errors
         """
+        post = self._posts.get(shortcode)
+        if post is not None:
+            logger.info(f"Using cached post data for {shortcode}")
+            return post
+
         try:
             logger.info(f"Fetching post data for shortcode: {shortcode}")
 
             # Fetch HTML page and extract JSON from script tag
             url = f"https://www.instagram.com/p/{shortcode}/"
-            response = self.session.get(
+            cached = self._validators.get(url)
+            response = rate_limited_get(
+                self.session,
+                self._limiter,
                 url,
+                headers=_conditional_headers(cached),
                 timeout=settings.request_timeout_seconds
             )
 
+            if cached is not None and response.status_code == 304:
+                logger.info(f"Post page unchanged, using cached data for {shortcode}")
+                self._posts.set(shortcode, cached[2])
+                return cached[2]
+
             # Check for rate limiting
             if response.status_code == 429:
                 logger.warning(f"Rate limit hit for {shortcode}")
                 raise RateLimitExceededError(
                     "Instagram rate limit exceeded, please try again later",
-                    details={"shortcode": shortcode, "retry_after_seconds": 300}
+                    details={"shortcode": shortcode, "retry_after_seconds": _retry_after_seconds(response)}
                 )
 
             # Check for not found
@@ -94,7 +234,7 @@ class InstagramGraphQL:
             response.raise_for_status()
 
             # Extract JSON data from HTML
-            post_data = self._extract_json_from_html(response.text, shortcode)
+            post_data = self._extract_json_from_html(response.content, shortcode)
 
             # Check if private
             if post_data.get('is_private', False):
@@ -105,7 +245,15 @@ class InstagramGraphQL:
                 )
 
             logger.info(f"Successfully fetched data for {shortcode}")
-            return self._parse_post_data(post_data, shortcode)
+            parsed = self._parse_post_data(post_data, shortcode)
+
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                self._validators.set(url, (etag, last_modified, parsed))
+            self._posts.set(shortcode, parsed)
+
+            return parsed
 
         except (PrivateAccountError, ContentNotFoundError, RateLimitExceededError, InstagramAPIError):
             raise
@@ -122,11 +270,32 @@ class InstagramGraphQL:
                 details={"shortcode": shortcode}
             )
 
-    def _extract_json_from_html(self, html: str, shortcode: str) -> Dict[str, Any]:
+    async def gather_posts(
+        self,
+        shortcodes: List[str],
+        concurrency: int = 8,
+    ) -> List[Union[PostData, Exception]]:
+        """Fetch post data for several shortcodes concurrently.
+
+        Each fetch runs get_post_data() in a worker thread over the shared
+        session (see app.http_client.gather_unique). Duplicate shortcodes are
+        fetched once and share the result.
+
+        Args:
+            shortcodes: Instagram post shortcodes
+            concurrency: Maximum simultaneous requests
+
+        Returns:
+            One entry per shortcode, in order: the parsed post data, or the
+            exception raised for that shortcode
+        """
+        return await gather_unique(self.get_post_data, shortcodes, concurrency)
+
+    def _extract_json_from_html(self, html: bytes, shortcode: str) -> Dict[str, Any]:
         """Extract JSON data from Instagram HTML page.
 
         Args:
-            html: HTML content
+            html: Raw HTML response body
             shortcode: Post shortcode
 
         Returns:
@@ -135,33 +304,23 @@ class InstagramGraphQL:
         Raises:
             InstagramAPIError: Failed to extract JSON data
         """
-        import json
-        import re
-
         # Look for JSON data in script tags
-        # Instagram embeds data in <script type="application/ld+json">
-        patterns = [
-            r'<script type="application/ld\+json">({.*?})</script>',
-            r'window\._sharedData = ({.*?});</script>',
-            r'"xdt_api__v1__media__shortcode__web_info":\s*({.*?})(?:,|\})',
-        ]
-
-        for pattern in patterns:
-            matches = re.findall(pattern, html, re.DOTALL)
-            if matches:
+        for marker in _EMBEDDED_JSON_MARKERS:
+            json_text = _find_json_object(html, marker)
+            if json_text:
                 try:
-                    data = json.loads(matches[0])
-                    logger.debug(f"Extracted JSON data using pattern: {pattern[:50]}")
+                    data = orjson.loads(json_text)
+                    logger.debug(f"Extracted JSON data after marker: {marker!r}")
 
                     # Try different data structures
-                    if '@type' in data and data['@type'] == 'ImageObject':
+                    if data.get('@type') in ('ImageObject', 'VideoObject'):
                         return self._parse_ld_json(data, shortcode)
                     elif 'entry_data' in data:
                         return self._parse_shared_data(data, shortcode)
                     elif 'items' in data:
                         return data['items'][0] if data['items'] else {}
 
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     continue
 
         # If no JSON found, this might be login-required
@@ -179,14 +338,22 @@ class InstagramGraphQL:
             shortcode: Post shortcode
 
         Returns:
-            Standardized post data
+            Standardized post data (GraphVideo for a VideoObject, else GraphImage)
         """
+        is_video = data.get('@type') == 'VideoObject'
+        content_url = data.get('contentUrl')
+        thumbnail_url = data.get('thumbnailUrl')
+        if isinstance(thumbnail_url, list):
+            thumbnail_url = thumbnail_url[0] if thumbnail_url else None
+
         return {
-            '__typename': 'GraphImage',
+            '__typename': 'GraphVideo' if is_video else 'GraphImage',
             'shortcode': shortcode,
-            'is_video': data.get('@type') == 'VideoObject',
-            'display_url': data.get('contentUrl') or data.get('url'),
-            'video_url': data.get('contentUrl') if data.get('@type') == 'VideoObject' else None,
+            'is_video': is_video,
+            # For videos contentUrl is the MP4, so the still image is the thumbnail
+            'display_url': (thumbnail_url or content_url) if is_video else (content_url or data.get('url')),
+            'thumbnail_src': thumbnail_url,
+            'video_url': content_url if is_video else None,
             'edge_media_to_caption': {
                 'edges': [{'node': {'text': data.get('caption', '')}}]
             },
@@ -218,7 +385,7 @@ class InstagramGraphQL:
                 details={"shortcode": shortcode}
             )
 
-    def _parse_post_data(self, data: Dict[str, Any], shortcode: str) -> Dict[str, Any]:
+    def _parse_post_data(self, data: Dict[str, Any], shortcode: str) -> PostData:
         """Parse Instagram API response into standardized format.
 
         Args:
@@ -226,60 +393,69 @@ class InstagramGraphQL:
             shortcode: Post shortcode
 
         Returns:
-            Standardized post data dictionary
+            Standardized post data
         """
-        # Determine media type
-        typename = data.get('__typename', '')
-        is_video = data.get('is_video', False)
+        get = data.get
+        typename = get('__typename', '')
+        is_video = get('is_video', False)
+
+        # Hoist shared sub-objects once; "or" also covers keys present with a null value
+        owner = get('owner') or {}
+        dims = get('dimensions') or {}
+        location = get('location')
+        display_url = get('display_url')
 
         # Extract carousel items if present
         carousel_items = []
-        if typename == 'GraphSidecar' or 'edge_sidecar_to_children' in data:
-            edges = data.get('edge_sidecar_to_children', {}).get('edges', [])
-            for edge in edges:
-                node = edge.get('node', {})
+        sidecar = get('edge_sidecar_to_children')
+        if typename == 'GraphSidecar' or sidecar is not None:
+            for edge in (sidecar or {}).get('edges') or ():
+                node = edge.get('node') or {}
+                node_video = node.get('is_video')
+                node_dims = node.get('dimensions') or {}
                 carousel_items.append({
-                    'is_video': node.get('is_video', False),
-                    'url': node.get('video_url') if node.get('is_video') else node.get('display_url'),
-                    'width': node.get('dimensions', {}).get('width'),
-                    'height': node.get('dimensions', {}).get('height'),
+                    'is_video': node_video or False,
+                    'url': node.get('video_url') if node_video else node.get('display_url'),
+                    'width': node_dims.get('width'),
+                    'height': node_dims.get('height'),
                 })
 
         # Get caption
-        caption_edges = data.get('edge_media_to_caption', {}).get('edges', [])
+        caption_edges = (get('edge_media_to_caption') or {}).get('edges')
         caption = caption_edges[0]['node']['text'] if caption_edges else ""
 
-        # Get owner info
-        owner = data.get('owner', {})
+        timestamp = get('taken_at_timestamp')
+        if timestamp is None:
+            timestamp = int(datetime.now().timestamp())
 
         # Build standardized response
-        parsed = {
-            'shortcode': shortcode,
-            'typename': typename,
-            'is_video': is_video,
-            'is_carousel': len(carousel_items) > 0,
-            'caption': caption,
-            'timestamp': data.get('taken_at_timestamp', int(datetime.now().timestamp())),
+        return PostData(
+            shortcode=shortcode,
+            typename=typename,
+            is_video=is_video,
+            is_carousel=len(carousel_items) > 0,
+            caption=caption,
+            timestamp=timestamp,
 
             # Media URLs
-            'video_url': data.get('video_url'),
-            'display_url': data.get('display_url'),
-            'thumbnail_url': data.get('thumbnail_src') or data.get('display_url'),
+            video_url=get('video_url'),
+            display_url=display_url,
+            thumbnail_url=get('thumbnail_src') or display_url,
 
             # Carousel items
-            'carousel_items': carousel_items,
+            carousel_items=tuple(carousel_items),
 
             # Dimensions
-            'width': data.get('dimensions', {}).get('width'),
-            'height': data.get('dimensions', {}).get('height'),
+            width=dims.get('width'),
+            height=dims.get('height'),
 
             # Engagement
-            'likes': data.get('edge_media_preview_like', {}).get('count', 0),
-            'comments': data.get('edge_media_to_comment', {}).get('count', 0),
-            'views': data.get('video_view_count', 0) if is_video else None,
+            likes=(get('edge_media_preview_like') or {}).get('count', 0),
+            comments=(get('edge_media_to_comment') or {}).get('count', 0),
+            views=get('video_view_count', 0) if is_video else None,
 
             # Author
-            'author': {
+            author={
                 'username': owner.get('username', ''),
                 'full_name': owner.get('full_name', ''),
                 'profile_pic_url': owner.get('profile_pic_url', ''),
@@ -287,10 +463,8 @@ class InstagramGraphQL:
             },
 
             # Location
-            'location': data.get('location', {}).get('name') if data.get('location') else None,
-        }
-
-        return parsed
+            location=location.get('name') if location else None,
+        )
 
     def download_media(self, url: str, output_path: str) -> None:
         """Download media file from URL.
@@ -301,11 +475,27 @@ class InstagramGraphQL:
         """
         logger.info(f"Downloading media from {url}")
 
-        response = self.session.get(url, stream=True, timeout=30)
-        response.raise_for_status()
-
-        with open(output_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        # Why: the with-block returns the connection to the pool even on errors;
+        # copyfileobj moves the raw stream in 1 MiB blocks without a per-chunk Python loop
+        with self.session.get(url, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            with open(output_path, 'wb') as f:
+                shutil.copyfileobj(response.raw, f, COPY_BUFFER_SIZE)
 
         logger.info(f"Media saved to {output_path}")
+
+    def download_many(self, jobs: List[Tuple[str, str]], max_workers: int = 8) -> None:
+        """Download several media URLs (e.g. carousel items) concurrently.
+
+        Workers share this client's keep-alive session, so each item reuses a
+        warm CDN connection instead of waiting for the previous one to finish.
+
+        Args:
+            jobs: (media URL, output path) pairs
+            max_workers: Maximum simultaneous downloads
+
+        Raises:
+            The first download error, after all downloads have finished
+        """
+        download_concurrently(self.download_media, jobs, max_workers)
@@ -8,20 +8,71 @@ Use with caution and respect rate limits.
 """
 
 import logging
+import os
 import re
+import shutil
 import requests
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Union
 from datetime import datetime
 
+import orjson
+
+from app.cache import TTLCache
 from app.config import settings
 from app.exceptions import (
     ContentNotFoundError,
     DownloadFailedError,
     InstagramAPIError,
+    RateLimitExceededError,
+)
+from app.http_client import (
+    COPY_BUFFER_SIZE,
+    download_concurrently,
+    gather_unique,
+    make_session,
+    rate_limited_get,
 )
+from app.rate_limiter import HostRateLimiter, get_instagram_limiter
 
 logger = logging.getLogger(__name__)
 
+# Full CDN media URLs on cdninstagram.com (group 1 set) or fbcdn.net, in one pass
+# (scontent*.cdninstagram.com hosts are covered by the cdninstagram branch)
+_CDN_URL_RE = re.compile(
+    r'https://[^\s"\'<>]+\.(?:(cdninstagram)\.com|fbcdn\.net)/[^\s"\'<>]+\.(?:jpg|png|mp4)',
+    re.ASCII,  # \s checks only ASCII whitespace; CDN URLs in page source are ASCII anyway
+)
+
+# The post's own media type from the embed page's JSON, which often sits inside an
+# escaped JS string (hence the optional backslashes); the first match is the post itself
+_EMBED_TYPENAME_RE = re.compile(r'\\?"__typename\\?"\s*:\s*\\?"(?:XDT)?Graph(Image|Video|Sidecar)\\?"')
+_EMBED_IS_VIDEO_RE = re.compile(r'\\?"is_video\\?"\s*:\s*(true|false)')
+_EMBED_MEDIA_TYPES = {'Image': 'photo', 'Video': 'video', 'Sidecar': 'carousel'}
+
+
+def _size_limit_error(size_bytes: int, max_bytes: int) -> DownloadFailedError:
+    """Build the error for CDN media over the size limit."""
+    size_mb = size_bytes / (1024 * 1024)
+    limit_mb = max_bytes / (1024 * 1024)
+    return DownloadFailedError(
+        f"File size ({size_mb:.1f}MB) exceeds limit ({limit_mb:.0f}MB)",
+        details={"file_size_mb": size_mb, "limit_mb": limit_mb},
+    )
+
+
+def _embed_media_type(html: str) -> Optional[str]:
+    """Return 'photo', 'video' or 'carousel' from the embed page's structured data, or None.
+
+    Why: the CDN URLs alone are no guide, since video embeds often list only a poster jpg.
+    """
+    match = _EMBED_TYPENAME_RE.search(html)
+    if match:
+        return _EMBED_MEDIA_TYPES[match.group(1)]
+    match = _EMBED_IS_VIDEO_RE.search(html)
+    if match:
+        return 'video' if match.group(1) == 'true' else 'photo'
+    return None
+
 
 class InstagramProxyDownloader:
     """Instagram downloader using embed and oembed endpoints."""
@@ -39,18 +90,59 @@ class InstagramProxyDownloader:
         r'https://.*\.fbcdn\.net/.*\.(jpg|png|mp4)',
     ]
 
-    def __init__(self):
-        """Initialize with browser-like headers."""
-        self.session = requests.Session()
+    def __init__(self, limiter: Optional[HostRateLimiter] = None):
+        """Initialize with browser-like headers.
+
+        Args:
+            limiter: Outbound rate limiter (defaults to the one shared by all Instagram clients)
+        """
+        self._limiter = limiter or get_instagram_limiter()
+        self.session = make_session()
         self.session.headers.update({
             'User-Agent': settings.user_agent,
             'Accept': '*/*',
             'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
             'Referer': 'https://www.instagram.com/',
             'Origin': 'https://www.instagram.com',
         })
 
+        # CDN URL -> (local path, ETag, Last-Modified) of the last completed download
+        # Why: repeat downloads revalidate with a conditional GET and get a 304 instead of the body
+        self._validators = TTLCache(maxsize=1024, ttl_seconds=3600)
+
+        # Embed-page results from quick_probe ({} when it had no media), consumed by the next get_media_urls call
+        self._probed = TTLCache(maxsize=512, ttl_seconds=300)
+
+        # Embed page URL -> (ETag, Last-Modified, parsed result), revalidated with a conditional GET
+        self._page_validators = TTLCache(maxsize=1024, ttl_seconds=3600)
+
+        # Shortcode -> resolved media URLs; repeat lookups within 10 minutes skip the network entirely
+        self._results = TTLCache(maxsize=1024, ttl_seconds=600)
+
+    def quick_probe(self, shortcode: str) -> Optional[Dict[str, Any]]:
+        """Cheaply classify a post from its public embed page.
+
+        The embed data is kept briefly so a following get_media_urls() call
+        for the same post does not fetch it again.
+
+        Args:
+            shortcode: Instagram post shortcode
+
+        Returns:
+            {'public': True, 'type': 'photo' | 'video' | 'carousel' | None}, or
+            None if the embed page did not expose any media. type is None when
+            the page's structured data does not say what the post is
+
+        Raises:
+            ContentNotFoundError: Post not found
+        """
+        data = self._try_embed_page(shortcode)
+        self._probed.set(shortcode, data or {})
+        if not data:
+            return None
+
+        return {'public': True, 'type': data.get('media_type')}
+
     def get_media_urls(self, shortcode: str) -> Dict[str, Any]:
         """Extract media URLs without authentication.
 
@@ -69,37 +161,86 @@ class InstagramProxyDownloader:
             ContentNotFoundError: Post not found
             InstagramAPIError: Extraction failed
         """
-        logger.info(f"Attempting proxy download for: {shortcode}")
+        result = self._results.get(shortcode)
+        if result is not None:
+            logger.info("Using cached media URLs for %s", shortcode)
+            return result
+
+        logger.info("Attempting proxy download for: %s", shortcode)
+        result = self._probed.pop(shortcode)
+        if not result:
+            # An empty probe already showed the embed page has no media; don't fetch it again
+            result = self._resolve_media_urls(shortcode, skip_embed=result is not None)
+
+        self._results.set(shortcode, result)
+        return result
 
+    def _resolve_media_urls(self, shortcode: str, skip_embed: bool = False) -> Dict[str, Any]:
+        """Try each public extraction method in turn until one yields media URLs.
+
+        A rate-limit pause is re-raised at once, since every method hits the same host.
+
+        Args:
+            shortcode: Instagram post shortcode
+            skip_embed: Skip the embed page (quick_probe already found no media there)
+        """
         # Method 1: Try oEmbed API
         try:
             oembed_data = self._try_oembed(shortcode)
             if oembed_data:
                 return oembed_data
+        except RateLimitExceededError:
+            raise
         except Exception as e:
-            logger.warning(f"oEmbed failed: {e}")
+            logger.warning("oEmbed failed: %s", e)
 
         # Method 2: Try embed page
-        try:
-            embed_data = self._try_embed_page(shortcode)
-            if embed_data:
-                return embed_data
-        except Exception as e:
-            logger.warning(f"Embed page failed: {e}")
+        if not skip_embed:
+            try:
+                embed_data = self._try_embed_page(shortcode)
+                if embed_data:
+                    return embed_data
+            except RateLimitExceededError:
+                raise
+            except Exception as e:
+                logger.warning("Embed page failed: %s", e)
 
         # Method 3: Try public JSON endpoint
         try:
             json_data = self._try_json_endpoint(shortcode)
             if json_data:
                 return json_data
+        except RateLimitExceededError:
+            raise
         except Exception as e:
-            logger.warning(f"JSON endpoint failed: {e}")
+            logger.warning("JSON endpoint failed: %s", e)
 
         raise InstagramAPIError(
             "All proxy methods failed - Instagram may require authentication",
             details={"shortcode": shortcode}
         )
 
+    async def gather_media_urls(
+        self,
+        shortcodes: List[str],
+        concurrency: int = 8,
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """Extract media URLs for several shortcodes concurrently.
+
+        Each lookup runs get_media_urls() in a worker thread over the shared
+        session (see app.http_client.gather_unique). Duplicate shortcodes are
+        fetched once and share the result.
+
+        Args:
+            shortcodes: Instagram post shortcodes
+            concurrency: Maximum simultaneous lookups
+
+        Returns:
+            One entry per shortcode, in order: the media URL data, or the
+            exception raised for that shortcode
+        """
+        return await gather_unique(self.get_media_urls, shortcodes, concurrency)
+
     def _try_oembed(self, shortcode: str) -> Optional[Dict[str, Any]]:
         """Try Instagram oEmbed API (public endpoint).
 
@@ -112,7 +253,9 @@ class InstagramProxyDownloader:
         url = f"https://www.instagram.com/p/{shortcode}/"
 
         try:
-            response = self.session.get(
+            response = rate_limited_get(
+                self.session,
+                self._limiter,
                 self.OEMBED_URL,
                 params={
                     'url': url,
@@ -128,9 +271,9 @@ class InstagramProxyDownloader:
                 )
 
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
 
-            logger.info(f"oEmbed success for {shortcode}")
+            logger.info("oEmbed success for %s", shortcode)
 
             # Extract thumbnail URL from HTML
             thumbnail_url = None
@@ -150,7 +293,7 @@ class InstagramProxyDownloader:
             }
 
         except requests.exceptions.RequestException as e:
-            logger.warning(f"oEmbed request failed: {e}")
+            logger.warning("oEmbed request failed: %s", e)
             return None
 
     def _try_embed_page(self, shortcode: str) -> Optional[Dict[str, Any]]:
@@ -165,12 +308,28 @@ class InstagramProxyDownloader:
         embed_url = self.EMBED_URL.format(shortcode=shortcode)
 
         try:
-            response = self.session.get(
+            cached = self._page_validators.get(embed_url)
+            headers = {}
+            if cached is not None:
+                etag, last_modified, _ = cached
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
+
+            response = rate_limited_get(
+                self.session,
+                self._limiter,
                 embed_url,
+                headers=headers,
                 timeout=10,
                 allow_redirects=True
             )
 
+            if cached is not None and response.status_code == 304:
+                logger.info("Embed page unchanged, using cached data for %s", shortcode)
+                return cached[2]
+
             if response.status_code == 404:
                 raise ContentNotFoundError(
                     "Post not found",
@@ -187,23 +346,37 @@ class InstagramProxyDownloader:
                 logger.warning("No CDN URLs found in embed page")
                 return None
 
-            logger.info(f"Embed page success for {shortcode}: {len(media_urls)} URLs")
+            logger.info("Embed page success for %s: %d URLs", shortcode, len(media_urls))
 
             # Determine media type
-            has_video = any('.mp4' in url for url in media_urls)
-            has_image = any(url.endswith(('.jpg', '.png')) for url in media_urls)
-
-            return {
+            # One pass; has_image only matters when there is no video, so stop at the first one
+            has_video = has_image = False
+            for url in media_urls:
+                if '.mp4' in url:
+                    has_video = True
+                    break
+                if url.endswith(('.jpg', '.png')):
+                    has_image = True
+
+            data = {
                 'method': 'embed',
                 'shortcode': shortcode,
                 'media_urls': media_urls,
                 'is_video': has_video,
                 'is_photo': has_image and not has_video,
                 'is_carousel': len(media_urls) > 2,  # Heuristic
+                'media_type': _embed_media_type(html),
             }
 
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                self._page_validators.set(embed_url, (etag, last_modified, data))
+
+            return data
+
         except requests.exceptions.RequestException as e:
-            logger.warning(f"Embed page request failed: {e}")
+            logger.warning("Embed page request failed: %s", e)
             return None
 
     def _try_json_endpoint(self, shortcode: str) -> Optional[Dict[str, Any]]:
@@ -218,7 +391,9 @@ class InstagramProxyDownloader:
         url = f"https://www.instagram.com/p/{shortcode}/"
 
         try:
-            response = self.session.get(
+            response = rate_limited_get(
+                self.session,
+                self._limiter,
                 url,
                 params={'__a': '1', '__d': 'dis'},
                 timeout=10
@@ -239,7 +414,7 @@ class InstagramProxyDownloader:
 
             # Try to parse JSON
             try:
-                data = response.json()
+                data = orjson.loads(response.content)
 
                 # Navigate to media data
                 if 'graphql' in data:
@@ -249,7 +424,7 @@ class InstagramProxyDownloader:
                 else:
                     return None
 
-                logger.info(f"JSON endpoint success for {shortcode}")
+                logger.info("JSON endpoint success for %s", shortcode)
 
                 # Extract URLs
                 video_url = media.get('video_url')
@@ -269,7 +444,7 @@ class InstagramProxyDownloader:
                 return None
 
         except requests.exceptions.RequestException as e:
-            logger.warning(f"JSON endpoint request failed: {e}")
+            logger.warning("JSON endpoint request failed: %s", e)
             return None
 
     def _extract_cdn_urls(self, html: str) -> List[str]:
@@ -281,43 +456,91 @@ class InstagramProxyDownloader:
         Returns:
             List of CDN URLs
         """
-        urls = []
-
-        # Simple patterns that capture full URLs
-        simple_patterns = [
-            r'https://[^\s"\'<>]+\.cdninstagram\.com/[^\s"\'<>]+\.(?:jpg|png|mp4)',
-            r'https://scontent[^\s"\'<>]+\.cdninstagram\.com/[^\s"\'<>]+\.(?:jpg|png|mp4)',
-            r'https://[^\s"\'<>]+\.fbcdn\.net/[^\s"\'<>]+\.(?:jpg|png|mp4)',
-        ]
-
-        for pattern in simple_patterns:
-            matches = re.findall(pattern, html)
-            urls.extend(matches)
-
-        # Remove duplicates while preserving order
-        seen = set()
-        result = []
-        for url in urls:
-            if url not in seen and url.startswith('http'):
-                seen.add(url)
-                result.append(url)
+        instagram_urls = []
+        facebook_urls = []
 
-        return result
+        for match in _CDN_URL_RE.finditer(html):
+            if match.group(1):
+                instagram_urls.append(match.group())
+            else:
+                facebook_urls.append(match.group())
+
+        # cdninstagram.com URLs first (the first URL is used as the main media),
+        # duplicates removed while preserving order
+        return list(dict.fromkeys(instagram_urls + facebook_urls))
 
-    def download_media(self, url: str, output_path: str) -> None:
+    def download_media(self, url: str, output_path: str, max_bytes: Optional[int] = None) -> None:
         """Download media from CDN URL.
 
         Args:
             url: CDN URL
             output_path: Local file path
+            max_bytes: Size limit, checked against Content-Length and the bytes
+                actually received (no separate HEAD request)
+
+        Raises:
+            DownloadFailedError: The media exceeds max_bytes (no partial file is left)
         """
-        logger.info(f"Downloading from CDN: {url}")
+        logger.info("Downloading from CDN: %s", url)
+
+        headers = {}
+        cached = self._validators.get(url)
+        if cached is not None and os.path.isfile(cached[0]):
+            cached_path, etag, last_modified = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        with self.session.get(url, headers=headers, stream=True, timeout=30) as response:
+            if headers and response.status_code == 304:
+                if cached_path != output_path:
+                    shutil.copyfile(cached_path, output_path)
+                logger.info("CDN content unchanged, reused: %s", cached_path)
+                return
 
-        response = self.session.get(url, stream=True, timeout=30)
-        response.raise_for_status()
+            response.raise_for_status()
+
+            content_length = response.headers.get('Content-Length')
+            if max_bytes is not None and content_length and content_length.isdigit():
+                if int(content_length) > max_bytes:
+                    raise _size_limit_error(int(content_length), max_bytes)
 
-        with open(output_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+            # Why: reading straight from the raw urllib3 stream in 1 MiB blocks
+            # avoids the per-8KiB-chunk loop of iter_content and lets the kernel see
+            # large sequential writes. decode_content keeps gzip'd responses correct.
+            response.raw.decode_content = True
+            received = 0
+            try:
+                with open(output_path, 'wb') as f:
+                    while chunk := response.raw.read(COPY_BUFFER_SIZE):
+                        received += len(chunk)
+                        # Content-Length may be missing or wrong; the running count is authoritative
+                        if max_bytes is not None and received > max_bytes:
+                            raise _size_limit_error(received, max_bytes)
+                        f.write(chunk)
+            except DownloadFailedError:
+                os.unlink(output_path)
+                raise
+
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                self._validators.set(url, (output_path, etag, last_modified))
+
+        logger.info("Download complete: %s", output_path)
+
+    def download_many(self, jobs: List[Tuple[str, str]], max_workers: int = 8) -> None:
+        """Download several media URLs (e.g. carousel items) concurrently.
+
+        Workers share this client's keep-alive session, so each item reuses a
+        warm CDN connection instead of waiting for the previous one to finish.
 
-        logger.info(f"Download complete: {output_path}")
+        Args:
+            jobs: (media URL, output path) pairs
+            max_workers: Maximum simultaneous downloads
+
+        Raises:
+            The first download error, after all downloads have finished
+        """
+        download_concurrently(self.download_media, jobs, max_workers)
@@ -9,39 +9,52 @@ Production-ready server with:
 - CORS support for web clients
 """
 
+import asyncio
 import logging
+import mimetypes
+import os
+import stat
+import time
+from email.utils import formatdate
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Union
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar, Union
+
+import orjson
 
 from fastapi import FastAPI, HTTPException, Request, status
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from app import __version__
+from app.cache import TTLCache
 from app.config import settings
 from app.models import (
     DownloadRequest,
     DownloadResponse,
     ErrorResponse,
     HealthCheckResponse,
+    MediaMetadata,
 )
 from app.downloader import ReelsDownloader
 from app.parser import ReelsURLParser
+from app.responses import (
+    error_response,
+    if_range_matches,
+    is_not_modified,
+    iter_file_range,
+    parse_range,
+)
 from app.metadata_storage import MetadataStorage
 from app.temp_storage import temp_storage
 from app.ai_analyzer import video_analyzer, analyze_and_cleanup
 from app.exceptions import (
     ReelsDownloaderError,
     InvalidURLError,
-    PrivateAccountError,
-    ContentNotFoundError,
-    RateLimitExceededError,
-    DownloadFailedError,
-    InstagramAPIError,
+    ServerBusyError,
 )
 
 # Configure logging
@@ -51,6 +64,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Video file extensions, lowercase; compare against suffix.lower()
+VIDEO_SUFFIXES = frozenset({'.mp4', '.webm', '.mkv'})
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Universal SNS Media Downloader API",
@@ -58,10 +74,17 @@ app = FastAPI(
     version=__version__,
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # Rate limiting - protects both our server and Instagram's API
-limiter = Limiter(key_func=get_remote_address)
+# moving-window counts requests in the trailing minute (no burst at window edges);
+# with a Redis storage URI the limit holds across all uvicorn workers
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=settings.rate_limit_storage_uri,
+    strategy="moving-window",
+)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
@@ -74,17 +97,128 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files for serving downloaded media
-if settings.download_dir.exists():
-    app.mount(
-        "/downloads",
-        StaticFiles(directory=str(settings.download_dir)),
-        name="downloads"
-    )
-
 # Initialize Instagram downloader
 downloader = ReelsDownloader()
 
+# Blocking download work runs here so the event loop keeps serving requests
+# Why: download() does network and disk I/O for seconds; called directly from an
+# async handler it would stall every other request behind it
+DOWNLOAD_POOL = ThreadPoolExecutor(
+    max_workers=settings.max_concurrent_downloads,
+    thread_name_prefix="download",
+)
+
+# Video analysis gets its own threads so slow analyses can't starve downloads of workers
+ANALYSIS_POOL = ThreadPoolExecutor(
+    max_workers=settings.max_concurrent_analyses,
+    thread_name_prefix="analysis",
+)
+
+T = TypeVar("T")
+
+
+async def run_blocking(
+    func: Callable[..., T], *args: Any, pool: ThreadPoolExecutor = DOWNLOAD_POOL
+) -> T:
+    """Run a blocking call on pool (DOWNLOAD_POOL by default) and await its result."""
+    return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+
+
+# Shortcode -> (media_path, thumbnail_path, metadata) of a recent download
+# Why: repeat requests for a post return the files already on disk instead of
+# re-running the download strategies
+_download_results = TTLCache(maxsize=1024, ttl_seconds=300)
+
+# Shortcode -> the in-progress download task that concurrent requests for it join
+# Why: merging duplicates before admission means only one request per post takes a
+# download slot and a pool thread; a burst on one post can't crowd out the others
+_download_tasks: Dict[str, asyncio.Task] = {}
+
+
+# Admission control for downloads: DOWNLOAD_POOL bounds how many run, this bounds how many wait
+# Why: an unbounded queue lets a burst pile up minutes of work that clients have long given up on
+_download_slots = asyncio.Semaphore(settings.max_concurrent_downloads)
+_download_waiting = 0
+_downloads_in_flight = 0
+
+
+async def _run_download(shortcode: str, is_post: bool) -> Tuple[Path, Optional[Path], MediaMetadata]:
+    """Run downloader.download in a download slot, or raise ServerBusyError if the queue is full."""
+    global _download_waiting, _downloads_in_flight
+    if _download_slots.locked() and _download_waiting >= settings.max_download_queue:
+        raise ServerBusyError(
+            "Too many downloads in progress, please retry shortly",
+            details={"retry_after_seconds": 5},
+        )
+
+    _download_waiting += 1
+    try:
+        await _download_slots.acquire()
+    finally:
+        _download_waiting -= 1
+
+    _downloads_in_flight += 1
+    try:
+        return await run_blocking(downloader.download, shortcode, is_post)
+    finally:
+        _downloads_in_flight -= 1
+        _download_slots.release()
+
+
+async def download_cached(
+    shortcode: str, is_post: bool = False
+) -> Tuple[Path, Optional[Path], MediaMetadata]:
+    """Return a recent download result for shortcode if its files still exist, else download.
+
+    Concurrent calls for the same shortcode share one download. is_post marks
+    /p/ URLs, the only ones the downloader probes for a single photo.
+    """
+    cached = _download_results.get(shortcode)
+    if cached is not None:
+        media_path, thumbnail_path, _ = cached
+        # Files may have been removed since (analysis cleanup, temp storage expiry)
+        if media_path.is_file() and (thumbnail_path is None or thumbnail_path.is_file()):
+            logger.info(f"Using cached download for {shortcode}")
+            return cached
+        _download_results.pop(shortcode)
+
+    task = _download_tasks.get(shortcode)
+    if task is None:
+        task = asyncio.ensure_future(_run_download(shortcode, is_post))
+        _download_tasks[shortcode] = task
+        task.add_done_callback(lambda _: _download_tasks.pop(shortcode, None))
+    else:
+        logger.info("Download already in progress for %s, joining it", shortcode)
+
+    # shield: a disconnecting client must not cancel the download other requests are waiting on
+    result = await asyncio.shield(task)
+    _download_results.set(shortcode, result)
+    return result
+
+
+@app.on_event("shutdown")
+def shutdown_download_pool():
+    """Stop accepting new blocking work; running downloads and analyses finish in the background."""
+    DOWNLOAD_POOL.shutdown(wait=False)
+    ANALYSIS_POOL.shutdown(wait=False)
+
+
+# (download dir usable, monotonic time checked); health probes hit this every few seconds
+_download_dir_status = (False, float("-inf"))
+DOWNLOAD_DIR_RECHECK_SECONDS = 30.0
+
+
+def _download_dir_writable() -> bool:
+    """Return whether the download directory exists and is writable, re-checked at most every 30s."""
+    global _download_dir_status
+    ok, checked_at = _download_dir_status
+    now = time.monotonic()
+    if now - checked_at >= DOWNLOAD_DIR_RECHECK_SECONDS:
+        path = settings.download_dir
+        ok = os.path.isdir(path) and os.access(path, os.W_OK)
+        _download_dir_status = (ok, now)
+    return ok
+
 
 @app.get(
     "/health",
@@ -95,13 +229,18 @@ downloader = ReelsDownloader()
 async def health_check():
     """Check service health and dependencies."""
     checks = {
-        "download_dir_writable": settings.download_dir.exists() and settings.download_dir.is_dir(),
+        "download_dir_writable": _download_dir_writable(),
         "downloader_initialized": downloader is not None,
         "instagram_auth": downloader.has_auth if downloader else False,
+        "download_queue_available": _download_waiting < settings.max_download_queue,
     }
 
     status_value = "healthy" if all(checks.values()) else "degraded"
 
+    # Saturation gauges for operators (not part of the healthy/degraded decision)
+    checks["download_slots_free"] = settings.max_concurrent_downloads - _downloads_in_flight
+    checks["download_queue_length"] = _download_waiting
+
     return HealthCheckResponse(
         status=status_value,
         version=__version__,
@@ -143,29 +282,31 @@ async def download_media(request: Request, payload: DownloadRequest):
         logger.info(f"Processing download request for URL: {url_str}")
 
         # Parse Instagram URL to get shortcode
-        shortcode = ReelsURLParser.extract_shortcode(url_str)
+        shortcode = ReelsURLParser.extract_shortcode(payload.url)
 
         # Download media using Instagram downloader
-        media_path, thumbnail_path, metadata = downloader.download(shortcode)
+        is_post = ReelsURLParser.is_post_url(payload.url)
+        media_path, thumbnail_path, metadata = await download_cached(shortcode, is_post)
         platform_name = "instagram"
 
         # Determine media type from file extension
-        media_type = "video" if media_path.suffix.lower() in ['.mp4', '.webm', '.mkv'] else "photo"
+        media_type = "video" if media_path.suffix.lower() in VIDEO_SUFFIXES else "photo"
 
         # Extract identifier for URL generation
         identifier = media_path.parent.name
 
         # Generate access URLs (relative to our server)
-        media_url = f"/downloads/{identifier}/{media_path.name}"
-        thumbnail_url = f"/downloads/{identifier}/{thumbnail_path.name}" if thumbnail_path else None
+        prefix = f"/downloads/{identifier}/"
+        media_url = prefix + media_path.name
+        thumbnail_url = prefix + thumbnail_path.name if thumbnail_path else None
 
         # Load metadata summary if available (Instagram only for now)
         metadata_summary = None
         metadata_url = None
         if platform_name == "instagram" and settings.save_metadata:
-            metadata_summary = MetadataStorage.get_metadata_summary(metadata.shortcode)
+            metadata_summary = await asyncio.to_thread(MetadataStorage.get_metadata_summary, metadata.shortcode)
             if metadata_summary:
-                metadata_url = f"/downloads/{identifier}/{metadata.shortcode}_metadata.json"
+                metadata_url = f"{prefix}{metadata.shortcode}_metadata.json"
 
         return DownloadResponse(
             media_url=media_url,
@@ -178,76 +319,13 @@ async def download_media(request: Request, payload: DownloadRequest):
             mentions=metadata_summary.get("mentions") if metadata_summary else None
         )
 
-    except InvalidURLError as e:
-        logger.warning(f"Invalid URL: {str(e)}")
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content=ErrorResponse(
-                error_type="invalid_url",
-                message=e.message,
-                details=e.details
-            ).dict()
-        )
-
-    except PrivateAccountError as e:
-        logger.warning(f"Private account access attempt: {str(e)}")
-        return JSONResponse(
-            status_code=status.HTTP_403_FORBIDDEN,
-            content=ErrorResponse(
-                error_type="private_account",
-                message=e.message,
-                details=e.details
-            ).dict()
-        )
-
-    except ContentNotFoundError as e:
-        logger.warning(f"Content not found: {str(e)}")
-        return JSONResponse(
-            status_code=status.HTTP_404_NOT_FOUND,
-            content=ErrorResponse(
-                error_type="content_not_found",
-                message=e.message,
-                details=e.details
-            ).dict()
-        )
-
-    except RateLimitExceededError as e:
-        logger.warning(f"Instagram rate limit hit: {str(e)}")
-        return JSONResponse(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            content=ErrorResponse(
-                error_type="rate_limit_exceeded",
-                message=e.message,
-                details=e.details
-            ).dict()
-        )
-
-    except InstagramAPIError as e:
-        logger.error(f"Instagram API error: {str(e)}")
-        return JSONResponse(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            content=ErrorResponse(
-                error_type="instagram_api_error",
-                message=e.message,
-                details=e.details
-            ).dict()
-        )
-
-    except (DownloadFailedError, ReelsDownloaderError) as e:
-        logger.error(f"Download failed: {str(e)}")
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content=ErrorResponse(
-                error_type="download_failed",
-                message=e.message,
-                details=e.details
-            ).dict()
-        )
+    except ReelsDownloaderError as e:
+        return error_response(e)
 
     except Exception as e:
         # Catch-all for unexpected errors
         logger.exception(f"Unexpected error: {str(e)}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content=ErrorResponse(
                 error_type="internal_error",
@@ -286,13 +364,14 @@ async def analyze_video(request: Request, payload: DownloadRequest):
         logger.info(f"Processing AI analysis request for URL: {url_str}")
 
         # Parse Instagram URL and download temporarily
-        shortcode = ReelsURLParser.extract_shortcode(url_str)
-        media_path, thumbnail_path, metadata = downloader.download(shortcode)
+        shortcode = ReelsURLParser.extract_shortcode(payload.url)
+        is_post = ReelsURLParser.is_post_url(payload.url)
+        media_path, thumbnail_path, metadata = await download_cached(shortcode, is_post)
         platform_name = "instagram"
 
         # Only analyze videos (not photos)
-        if media_path.suffix.lower() not in ['.mp4', '.webm', '.mkv']:
-            return JSONResponse(
+        if media_path.suffix.lower() not in VIDEO_SUFFIXES:
+            return ORJSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 content=ErrorResponse(
                     error_type="invalid_media_type",
@@ -302,10 +381,10 @@ async def analyze_video(request: Request, payload: DownloadRequest):
             )
 
         # Analyze video and delete it
-        analysis_result = analyze_and_cleanup(media_path)
+        analysis_result = await run_blocking(analyze_and_cleanup, media_path, pool=ANALYSIS_POOL)
 
         # Return analysis result (no video URL, only text)
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_200_OK,
             content={
                 "status": "success",
@@ -315,9 +394,12 @@ async def analyze_video(request: Request, payload: DownloadRequest):
             }
         )
 
+    except ServerBusyError as e:
+        return error_response(e)
+
     except Exception as e:
         logger.exception(f"AI analysis failed: {str(e)}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content=ErrorResponse(
                 error_type="analysis_failed",
@@ -357,7 +439,7 @@ async def get_webview_media_url(request: Request, url: str):
         try:
             shortcode = ReelsURLParser.extract_shortcode(url)
         except (InvalidURLError, ValueError):
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 content=ErrorResponse(
                     error_type="unsupported_platform",
@@ -366,15 +448,15 @@ async def get_webview_media_url(request: Request, url: str):
                 ).dict()
             )
 
-        # Extract identifier
-        identifier = platform.extract_identifier(url)
+        # extract_shortcode only accepts instagram.com URLs, so the shortcode is the identifier
+        identifier = shortcode
 
         # Return platform info and guidance
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_200_OK,
             content={
                 "status": "success",
-                "platform": platform.platform_name.value,
+                "platform": "instagram",
                 "identifier": identifier,
                 "original_url": url,
                 "guidance": {
@@ -382,14 +464,14 @@ async def get_webview_media_url(request: Request, url: str):
                     "videos": "Use /api/analyze endpoint for AI analysis workflow",
                     "note": "For webview display, embed original URLs directly without downloading"
                 },
-                "instagram_embed_url": f"https://www.instagram.com/p/{identifier}/embed" if "instagram" in url else None,
-                "youtube_embed_url": f"https://www.youtube.com/embed/{identifier}" if "youtube" in url or "youtu.be" in url else None
+                "instagram_embed_url": f"https://www.instagram.com/p/{identifier}/embed",
+                "youtube_embed_url": None
             }
         )
 
     except Exception as e:
         logger.exception(f"Webview URL processing failed: {str(e)}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content=ErrorResponse(
                 error_type="processing_failed",
@@ -413,7 +495,7 @@ async def get_temp_storage_stats():
     - Cleanup settings
     """
     stats = temp_storage.get_storage_stats()
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_200_OK,
         content={
             "status": "success",
@@ -427,6 +509,113 @@ async def get_temp_storage_stats():
     )
 
 
+@app.api_route(
+    "/downloads/{identifier}/{filename}",
+    methods=["GET", "HEAD"],
+    tags=["Download"],
+    summary="Serve a downloaded media, thumbnail or metadata file"
+)
+async def serve_download(request: Request, identifier: str, filename: str):
+    """Serve a file from the download directory.
+
+    With ACCEL_REDIRECT_PREFIX set, the response only carries an
+    X-Accel-Redirect header so a fronting nginx sends the file itself with
+    sendfile(2); otherwise the file is streamed by FileResponse, or as a
+    206 partial response for single-range requests (video seeking). HEAD
+    gets the same headers without a body, as media players and link
+    checkers probe with it.
+    """
+    # Path params never contain "/", so only "." and ".." can escape the directory
+    if identifier in ('.', '..') or filename in ('.', '..'):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    path = settings.download_dir / identifier / filename
+    try:
+        stat_result = await asyncio.to_thread(os.stat, path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    headers = {
+        "ETag": f'W/"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"',
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+        # Media names are {date}_{shortcode} and never change; metadata JSON may be rewritten
+        "Cache-Control": "public, no-cache" if filename.endswith(".json") else "public, max-age=31536000, immutable",
+    }
+    if is_not_modified(request.headers, headers["ETag"], stat_result.st_mtime):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if settings.accel_redirect_prefix:
+        headers["X-Accel-Redirect"] = f"{settings.accel_redirect_prefix.rstrip('/')}/{identifier}/{filename}"
+        return Response(headers=headers)
+
+    headers["Accept-Ranges"] = "bytes"
+    if request.method == "HEAD":
+        headers["Content-Length"] = str(stat_result.st_size)
+        return Response(
+            media_type=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+            headers=headers,
+        )
+
+    range_header = request.headers.get("range")
+    # A stale If-Range means the client's partial copy is outdated: send the whole file
+    if range_header and if_range_matches(request.headers.get("if-range"), headers["Last-Modified"]):
+        size = stat_result.st_size
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE, headers=headers)
+
+        if byte_range is not None:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            headers["Content-Length"] = str(end - start + 1)
+            return StreamingResponse(
+                iter_file_range(path, start, end - start + 1),
+                status_code=status.HTTP_206_PARTIAL_CONTENT,
+                media_type=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+                headers=headers,
+            )
+
+    # FileResponse streams in fixed-size chunks, so memory stays bounded for large videos
+    return FileResponse(path, stat_result=stat_result, headers=headers)
+
+
+# The / payload never changes at runtime, so it is serialized once at import
+ROOT_PAYLOAD = {
+    "name": "Universal SNS Media Downloader & AI Analysis API",
+    "version": __version__,
+    "docs": "/docs",
+    "health": "/health",
+    "endpoints": {
+        "download": "POST /api/download - Download and serve media files",
+        "ai_analysis": "POST /api/analyze - AI analysis workflow (download → analyze → delete)",
+        "webview_urls": "GET /api/media/webview?url=... - Get embed URLs for webview",
+        "temp_stats": "GET /api/temp-storage/stats - Temporary storage statistics",
+        "access_media": "GET /downloads/{shortcode}/{filename} - Access downloaded files"
+    },
+    "legal_workflow": {
+        "videos": "Use /api/analyze for AI analysis (fair use compliant)",
+        "photos": "Use /api/media/webview for direct embed URLs"
+    },
+    "supported_platforms": ["instagram"],
+    "usage": {
+        "ai_analysis_example": {
+            "url": "https://www.youtube.com/shorts/RN4U9Gw-NZ8",
+            "note": "Video will be analyzed and deleted automatically"
+        },
+        "webview_example": {
+            "url": "https://www.instagram.com/p/ABC123/",
+            "note": "Returns embed URL for webview display"
+        }
+    }
+}
+ROOT_BODY = orjson.dumps(ROOT_PAYLOAD)
+
+
 @app.get(
     "/",
     tags=["Info"],
@@ -434,34 +623,7 @@ async def get_temp_storage_stats():
 )
 async def root():
     """Get API information and usage instructions."""
-    return {
-        "name": "Universal SNS Media Downloader & AI Analysis API",
-        "version": __version__,
-        "docs": "/docs",
-        "health": "/health",
-        "endpoints": {
-            "download": "POST /api/download - Download and serve media files",
-            "ai_analysis": "POST /api/analyze - AI analysis workflow (download → analyze → delete)",
-            "webview_urls": "GET /api/media/webview?url=... - Get embed URLs for webview",
-            "temp_stats": "GET /api/temp-storage/stats - Temporary storage statistics",
-            "access_media": "GET /downloads/{shortcode}/{filename} - Access downloaded files"
-        },
-        "legal_workflow": {
-            "videos": "Use /api/analyze for AI analysis (fair use compliant)",
-            "photos": "Use /api/media/webview for direct embed URLs"
-        },
-        "supported_platforms": ["instagram"],
-        "usage": {
-            "ai_analysis_example": {
-                "url": "https://www.youtube.com/shorts/RN4U9Gw-NZ8",
-                "note": "Video will be analyzed and deleted automatically"
-            },
-            "webview_example": {
-                "url": "https://www.instagram.com/p/ABC123/",
-                "note": "Returns embed URL for webview display"
-            }
-        }
-    }
+    return Response(ROOT_BODY, media_type="application/json")
 
 
 if __name__ == "__main__":
@@ -1,7 +1,7 @@
 """Pydantic models for request/response validation and serialization."""
 
 from typing import Optional, Literal, List
-from datetime import datetime
+from datetime import datetime, timezone
 
 from pydantic import BaseModel, HttpUrl, Field, validator
 
@@ -46,7 +46,7 @@ class MediaMetadata(BaseModel):
     height: Optional[int] = Field(None, description="Video height in pixels")
     size_bytes: Optional[int] = Field(None, description="File size in bytes")
     download_timestamp: datetime = Field(
-        default_factory=lambda: datetime.utcnow(),
+        default_factory=lambda: datetime.now(timezone.utc),
         description="When the download was completed"
     )
 
@@ -82,7 +82,7 @@ class HealthCheckResponse(BaseModel):
 
     status: Literal["healthy", "degraded", "unhealthy"]
     version: str
-    timestamp: datetime = Field(default_factory=lambda: datetime.utcnow())
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     checks: dict = Field(
         default_factory=dict,
         description="Individual health check results"
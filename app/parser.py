@@ -4,7 +4,7 @@ Handles multiple URL formats and extracts shortcodes for API consumption.
 """
 
 import re
-from typing import Optional
+from typing import Any, Optional, Union
 from urllib.parse import urlparse
 
 from app.exceptions import InvalidURLError
@@ -25,12 +25,27 @@ class ReelsURLParser:
         re.compile(r'instagram\.com/[^/]+/reel/([A-Za-z0-9_-]+)'),  # Username/reel format
     ]
 
+    # Post (/p/) URLs: the only kind that can be a single photo
+    POST_PATTERN = re.compile(r'instagram\.com/p/')
+
+    @staticmethod
+    def _host_and_path(url: Union[str, Any]) -> str:
+        """Return "host/path" for a URL string or an already-parsed URL object."""
+        host = getattr(url, "host", None)
+        if host is not None:
+            # Already parsed (e.g. a validated request model field): skip urlparse
+            return f"{host}{getattr(url, 'path', None) or ''}"
+        # Normalize URL - remove query parameters and fragments
+        parsed = urlparse(url)
+        return f"{parsed.netloc}{parsed.path}"
+
     @classmethod
-    def extract_shortcode(cls, url: str) -> str:
+    def extract_shortcode(cls, url: Union[str, Any]) -> str:
         """Extract Instagram shortcode from various URL formats.
 
         Args:
-            url: Instagram URL in any supported format
+            url: Instagram URL in any supported format, as a string or an
+                already-parsed URL object exposing .host and .path (pydantic HttpUrl)
 
         Returns:
             11-character shortcode used by Instagram API
@@ -42,12 +57,9 @@ class ReelsURLParser:
             >>> ReelsURLParser.extract_shortcode("https://instagram.com/reel/ABC_123-xyz/")
             "ABC_123-xyz"
         """
-        if not url or not isinstance(url, str):
+        if getattr(url, "host", None) is None and (not url or not isinstance(url, str)):
             raise InvalidURLError("URL must be a non-empty string")
-
-        # Normalize URL - remove query parameters and fragments
-        parsed = urlparse(url)
-        clean_url = f"{parsed.netloc}{parsed.path}"
+        clean_url = cls._host_and_path(url)
 
         # Try each pattern to extract shortcode
         for pattern in cls.URL_PATTERNS:
@@ -60,17 +72,29 @@ class ReelsURLParser:
                 else:
                     raise InvalidURLError(
                         f"Invalid shortcode format: {shortcode}",
-                        details={"shortcode": shortcode, "url": url}
+                        details={"shortcode": shortcode, "url": str(url)}
                     )
 
         raise InvalidURLError(
             "URL does not match any supported Instagram format",
             details={
-                "url": url,
+                "url": str(url),
                 "supported_formats": ["/reel/", "/p/", "/tv/"]
             }
         )
 
+    @classmethod
+    def is_post_url(cls, url: Union[str, Any]) -> bool:
+        """Check if URL points at a /p/ post rather than a reel or IGTV video.
+
+        Args:
+            url: Instagram URL, as a string or an already-parsed URL object
+
+        Returns:
+            True for /p/ URLs, False otherwise
+        """
+        return bool(cls.POST_PATTERN.search(cls._host_and_path(url)))
+
     @classmethod
     def validate_url(cls, url: str) -> bool:
         """Check if URL is a valid Instagram Reels URL.
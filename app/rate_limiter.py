@@ -0,0 +1,131 @@
+"""Outbound request rate limiting shared by the Instagram clients.
+
+Both the GraphQL client and the proxy downloader talk to instagram.com from
+the same IP. A per-host token bucket keeps their combined request rate under
+Instagram's budget and smooths bursts, and a Retry-After from any response
+pauses every caller of that host.
+"""
+
+import functools
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from app.config import settings
+from app.exceptions import RateLimitExceededError
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the wait in seconds a Retry-After value asks for (delta-seconds or HTTP-date).
+
+    Returns:
+        Seconds to wait (never negative), or None when the value is missing or unparseable
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class HostRateLimiter:
+    """Thread-safe token bucket per host, paused for everyone when the host rate-limits us."""
+
+    def __init__(self, rate_per_second: float = 5.0, burst: int = 10, max_wait_seconds: float = 15.0):
+        """Initialize limiter.
+
+        Args:
+            rate_per_second: Tokens added to each host's bucket per second
+            burst: Bucket capacity (requests allowed back to back after idling)
+            max_wait_seconds: Longest acquire() will block; longer waits raise instead
+        """
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.max_wait_seconds = max_wait_seconds
+        # host -> (tokens, monotonic time tokens accrue from); a future time means
+        # the host is paused until then (see penalize)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def _reserve(self, host: str) -> float:
+        """Take a token for host, returning how long the caller must wait before using it.
+
+        The token is only taken when that wait is within max_wait_seconds, so
+        refused callers don't push the host's schedule further out.
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, since = self._buckets.get(host, (float(self.burst), now))
+            if since < now:
+                tokens = min(float(self.burst), tokens + (now - since) * self.rate_per_second)
+                since = now
+            # Tokens may go negative: each waiter reserves its own slot in the future
+            tokens -= 1.0
+            deficit = -tokens / self.rate_per_second if tokens < 0 else 0.0
+            wait = (since - now) + deficit
+            if wait <= self.max_wait_seconds:
+                self._buckets[host] = (tokens, since)
+        return wait
+
+    def acquire(self, host: str) -> float:
+        """Block until a request to host may be sent.
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            RateLimitExceededError: If the host is paused for longer than max_wait_seconds
+        """
+        wait = self._reserve(host)
+        if wait > self.max_wait_seconds:
+            # Why: sleeping out a long Retry-After would park every worker thread on this host
+            raise RateLimitExceededError(
+                f"Requests to {host} are paused by rate limiting",
+                details={"host": host, "retry_after_seconds": math.ceil(wait)},
+            )
+        if wait <= 0:
+            return 0.0
+        time.sleep(wait)
+        return wait
+
+    def penalize(self, host: str, seconds: float) -> None:
+        """Stop all requests to host for the given number of seconds (e.g. from Retry-After)."""
+        if seconds <= 0:
+            return
+        self._drain(host, time.monotonic() + seconds)
+
+    def _drain(self, host: str, until: float) -> None:
+        """Empty host's bucket from `until`, so requests resume at the steady rate, not in a burst."""
+        with self._lock:
+            _, since = self._buckets.get(host, (0.0, until))
+            self._buckets[host] = (0.0, max(since, until))
+
+    def observe(self, host: str, status_code: int, headers: Optional[dict] = None) -> None:
+        """Adjust the host's budget from a response's status and rate-limit headers."""
+        headers = headers or {}
+        retry_after = headers.get('Retry-After')
+        seconds = parse_retry_after(retry_after)
+        if status_code == 429 or seconds is not None:
+            self.penalize(host, 60.0 if seconds is None else seconds)
+        elif headers.get('X-RateLimit-Remaining') == '0':
+            self._drain(host, time.monotonic())
+
+
+@functools.lru_cache(maxsize=1)
+def get_instagram_limiter() -> HostRateLimiter:
+    """Return the process-wide limiter shared by all Instagram clients."""
+    return HostRateLimiter(
+        rate_per_second=settings.instagram_requests_per_second,
+        burst=settings.instagram_request_burst,
+        max_wait_seconds=settings.instagram_rate_limit_max_wait_seconds,
+    )
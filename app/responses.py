@@ -0,0 +1,151 @@
+"""HTTP response helpers for the API endpoints.
+
+Maps downloader errors to JSON error responses, and implements conditional
+GET checks (304), byte-range parsing and If-Range validation for partial
+(206) responses from /downloads. Kept free of app state so they can be
+tested on their own.
+"""
+
+import logging
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Mapping, Optional, Tuple
+
+import aiofiles
+from fastapi import status
+from fastapi.responses import ORJSONResponse
+
+from app.exceptions import (
+    ReelsDownloaderError,
+    InvalidURLError,
+    PrivateAccountError,
+    ContentNotFoundError,
+    RateLimitExceededError,
+    DownloadFailedError,
+    InstagramAPIError,
+    ServerBusyError,
+)
+
+logger = logging.getLogger(__name__)
+
+# Read size for ranged (206) responses from /downloads
+RANGE_CHUNK_SIZE = 256 * 1024
+
+# Downloader error class -> (HTTP status, error_type, log level, log label)
+_ERROR_MAP = {
+    InvalidURLError: (status.HTTP_400_BAD_REQUEST, "invalid_url", logging.WARNING, "Invalid URL"),
+    PrivateAccountError: (status.HTTP_403_FORBIDDEN, "private_account", logging.WARNING, "Private account access attempt"),
+    ContentNotFoundError: (status.HTTP_404_NOT_FOUND, "content_not_found", logging.WARNING, "Content not found"),
+    RateLimitExceededError: (status.HTTP_429_TOO_MANY_REQUESTS, "rate_limit_exceeded", logging.WARNING, "Instagram rate limit hit"),
+    InstagramAPIError: (status.HTTP_503_SERVICE_UNAVAILABLE, "instagram_api_error", logging.ERROR, "Instagram API error"),
+    DownloadFailedError: (status.HTTP_500_INTERNAL_SERVER_ERROR, "download_failed", logging.ERROR, "Download failed"),
+    ServerBusyError: (status.HTTP_503_SERVICE_UNAVAILABLE, "server_busy", logging.WARNING, "Download queue full"),
+    ReelsDownloaderError: (status.HTTP_500_INTERNAL_SERVER_ERROR, "download_failed", logging.ERROR, "Download failed"),
+}
+
+
+def error_response(error: ReelsDownloaderError) -> ORJSONResponse:
+    """Map a downloader error to its JSON error response via _ERROR_MAP.
+
+    The nearest mapped class in the error's MRO wins, so subclasses without
+    their own entry (e.g. AuthenticationError) fall back to their parent's.
+    """
+    mapping = next(_ERROR_MAP[cls] for cls in type(error).__mro__ if cls in _ERROR_MAP)
+    status_code, error_type, level, label = mapping
+    logger.log(level, "%s: %s", label, error)
+    retry_after = error.details.get("retry_after_seconds")
+    # Same shape as ErrorResponse(...).dict(), without per-error model validation
+    return ORJSONResponse(
+        status_code=status_code,
+        headers={"Retry-After": str(retry_after)} if retry_after is not None else None,
+        content={
+            "status": "error",
+            "error_type": error_type,
+            "message": error.message,
+            "details": error.details,
+        },
+    )
+
+
+def is_not_modified(headers: Mapping[str, str], etag: str, mtime: float) -> bool:
+    """Return True if the client's cached copy (If-None-Match / If-Modified-Since) is current.
+
+    Args:
+        headers: Request headers (lower-case names, as Starlette exposes them)
+        etag: The file's current ETag
+        mtime: The file's modification time
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison; If-Modified-Since is ignored when If-None-Match is present
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def if_range_matches(if_range: Optional[str], last_modified: str) -> bool:
+    """Return True if a range request may be honoured under its If-Range validator.
+
+    If-Range needs a strong validator (RFC 9110 13.1.5). Our ETags are weak, so
+    an entity-tag never matches; a date matches only when it equals Last-Modified.
+    """
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith(('"', 'W/')):
+        return False
+    return if_range == last_modified
+
+
+def parse_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single-range "bytes=" header into an inclusive (start, end).
+
+    Returns:
+        The range, or None if the header should be ignored (malformed or multi-range)
+
+    Raises:
+        ValueError: The range lies entirely outside the file (416)
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, sep, last = spec.strip().partition("-")
+    if not sep or not (first.isdigit() or last.isdigit()):
+        return None
+    if first and last and not (first.isdigit() and last.isdigit()):
+        return None
+
+    if not first:
+        # Suffix range: the final N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError("empty suffix range")
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    if start >= size:
+        raise ValueError("range starts past end of file")
+    end = min(int(last), size - 1) if last else size - 1
+    if end < start:
+        return None
+    return start, end
+
+
+async def iter_file_range(path: Path, start: int, length: int):
+    """Yield length bytes of path from start in RANGE_CHUNK_SIZE blocks."""
+    async with aiofiles.open(path, "rb") as f:
+        await f.seek(start)
+        while length > 0:
+            chunk = await f.read(min(RANGE_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
@@ -0,0 +1,51 @@
+"""Unit tests for the in-process TTL cache.
+
+Tests cover expiry, LRU eviction, and basic dictionary-like operations.
+"""
+
+from app.cache import TTLCache
+
+
+class TestTTLCache:
+    """Test suite for TTLCache."""
+
+    def test_get_returns_stored_value(self, clock):
+        """Stored values are returned before they expire."""
+        cache = TTLCache(maxsize=4, ttl_seconds=10)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+
+    def test_get_missing_returns_default(self, clock):
+        """Missing keys return the provided default."""
+        cache = TTLCache()
+        assert cache.get("missing") is None
+        assert cache.get("missing", "fallback") == "fallback"
+
+    def test_entries_expire_after_ttl(self, clock):
+        """Entries are dropped once the TTL has elapsed."""
+        cache = TTLCache(maxsize=4, ttl_seconds=10)
+        cache.set("a", 1)
+        clock[0] += 10
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_entry_is_evicted(self, clock):
+        """When full, the least recently used entry is evicted first."""
+        cache = TTLCache(maxsize=2, ttl_seconds=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", 3)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_pop_and_clear(self, clock):
+        """pop removes a single entry, clear removes all."""
+        cache = TTLCache(maxsize=4, ttl_seconds=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.pop("a") == 1
+        assert cache.pop("a") is None
+        cache.clear()
+        assert len(cache) == 0
@@ -0,0 +1,32 @@
+"""Unit tests for the domain exception hierarchy."""
+
+import pickle
+
+from app.exceptions import (
+    ReelsDownloaderError,
+    RateLimitExceededError,
+    DownloadFailedError,
+)
+
+
+class TestReelsDownloaderError:
+    """Test suite for ReelsDownloaderError and subclasses."""
+
+    def test_message_and_details_are_kept(self):
+        """Message and details are exposed as attributes."""
+        error = RateLimitExceededError("slow down", details={"retry_after_seconds": 300})
+        assert error.message == "slow down"
+        assert error.details == {"retry_after_seconds": 300}
+        assert str(error) == "slow down"
+
+    def test_details_default_to_empty_dict(self):
+        """Omitted details become an empty dict."""
+        assert DownloadFailedError("failed").details == {}
+
+    def test_pickle_keeps_details(self):
+        """message and details survive a pickle round trip (e.g. across process pools)."""
+        error = DownloadFailedError("failed", details={"shortcode": "ABC"})
+        restored = pickle.loads(pickle.dumps(error))
+        assert isinstance(restored, ReelsDownloaderError)
+        assert restored.message == "failed"
+        assert restored.details == {"shortcode": "ABC"}
@@ -0,0 +1,88 @@
+"""Unit tests for the shared HTTP concurrency helpers.
+
+Tests cover shortcode deduplication, the concurrency bound and per-item
+exceptions in gather_unique, and error propagation in download_concurrently.
+"""
+
+import threading
+import time
+
+import pytest
+from app.http_client import download_concurrently, gather_unique
+
+
+class TestGatherUnique:
+    """Test suite for gather_unique."""
+
+    @pytest.mark.asyncio
+    async def test_duplicates_fetched_once(self):
+        """Repeated shortcodes share one fetch; results keep the input order."""
+        calls = []
+
+        def fetch(shortcode):
+            calls.append(shortcode)
+            return shortcode.upper()
+
+        assert await gather_unique(fetch, ["a", "b", "a"], concurrency=4) == ["A", "B", "A"]
+        assert sorted(calls) == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """No more than `concurrency` fetches run at the same time."""
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def fetch(shortcode):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            return shortcode
+
+        await gather_unique(fetch, [str(i) for i in range(8)], concurrency=2)
+        assert peak[0] <= 2
+
+    @pytest.mark.asyncio
+    async def test_exceptions_are_returned_per_shortcode(self):
+        """A failing shortcode yields its exception without failing the batch."""
+
+        def fetch(shortcode):
+            if shortcode == "bad":
+                raise ValueError(shortcode)
+            return shortcode
+
+        results = await gather_unique(fetch, ["ok", "bad", "bad"], concurrency=2)
+        assert results[0] == "ok"
+        assert isinstance(results[1], ValueError)
+        assert results[2] is results[1]
+
+
+class TestDownloadConcurrently:
+    """Test suite for download_concurrently."""
+
+    def test_runs_every_job(self):
+        """Each (url, path) job is passed to the download function."""
+        done = []
+        download_concurrently(lambda url, path: done.append((url, path)), [("u1", "p1"), ("u2", "p2")])
+        assert sorted(done) == [("u1", "p1"), ("u2", "p2")]
+
+    def test_first_error_raised_after_all_jobs(self):
+        """A failing job doesn't stop the others; its error is raised at the end."""
+        done = []
+
+        def download(url, path):
+            if url == "bad":
+                raise OSError(url)
+            time.sleep(0.01)
+            done.append(url)
+
+        with pytest.raises(OSError):
+            download_concurrently(download, [("bad", "p0"), ("u1", "p1"), ("u2", "p2")], max_workers=3)
+        assert sorted(done) == ["u1", "u2"]
+
+    def test_no_jobs(self):
+        """An empty job list is a no-op."""
+        download_concurrently(lambda url, path: pytest.fail("called"), [])
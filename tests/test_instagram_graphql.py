@@ -0,0 +1,123 @@
+"""Unit tests for embedded JSON extraction in the GraphQL client.
+
+Tests cover nested objects, braces inside strings, missing markers,
+JSON-LD and post parsing with absent or null fields, and Retry-After handling.
+"""
+
+from types import SimpleNamespace
+
+from app.instagram_graphql import InstagramGraphQL, _find_json_object, _retry_after_seconds
+
+
+class TestFindJsonObject:
+    """Test suite for _find_json_object."""
+
+    def test_returns_nested_object(self):
+        """The whole balanced object is returned, not the first closing brace."""
+        html = b'x "info": {"a": {"b": 1}, "c": [1, {"d": 2}]}, "next": 3'
+        assert _find_json_object(html, b'"info":') == b'{"a": {"b": 1}, "c": [1, {"d": 2}]}'
+
+    def test_ignores_braces_inside_strings(self):
+        """Braces and escaped quotes inside string values don't affect depth."""
+        html = b'<script type="application/ld+json">{"t": "a}b\\"{c"}</script>'
+        marker = b'<script type="application/ld+json">'
+        assert _find_json_object(html, marker) == b'{"t": "a}b\\"{c"}'
+
+    def test_non_ascii_text_is_kept_intact(self):
+        """UTF-8 multi-byte characters pass through the byte scan undamaged."""
+        html = 'window._sharedData = {"caption": "안녕 {}"};'.encode()
+        assert _find_json_object(html, b'window._sharedData = ').decode() == '{"caption": "안녕 {}"}'
+
+    def test_missing_marker_or_unbalanced_returns_none(self):
+        """No marker, no object after it, or an unterminated object give None."""
+        assert _find_json_object(b'<html></html>', b'window._sharedData = ') is None
+        assert _find_json_object(b'window._sharedData = null;', b'window._sharedData = ') is None
+        assert _find_json_object(b'window._sharedData = {"a": 1', b'window._sharedData = ') is None
+
+
+class TestParseLdJson:
+    """Test suite for InstagramGraphQL._parse_ld_json."""
+
+    def test_video_object(self):
+        """A VideoObject becomes a GraphVideo with contentUrl as its video URL."""
+        data = {
+            '@type': 'VideoObject',
+            'contentUrl': 'https://cdn/clip.mp4',
+            'thumbnailUrl': ['https://cdn/clip.jpg'],
+        }
+        parsed = InstagramGraphQL()._parse_post_data(
+            InstagramGraphQL()._parse_ld_json(data, 'abc123'), 'abc123'
+        )
+        assert parsed.typename == 'GraphVideo'
+        assert parsed.is_video is True
+        assert parsed.video_url == 'https://cdn/clip.mp4'
+        assert parsed.display_url == parsed.thumbnail_url == 'https://cdn/clip.jpg'
+
+    def test_image_object(self):
+        """An ImageObject stays a GraphImage with no video URL."""
+        data = {'@type': 'ImageObject', 'contentUrl': 'https://cdn/photo.jpg'}
+        parsed = InstagramGraphQL()._parse_ld_json(data, 'abc123')
+        assert parsed['__typename'] == 'GraphImage'
+        assert parsed['video_url'] is None
+        assert parsed['display_url'] == 'https://cdn/photo.jpg'
+
+
+class TestParsePostData:
+    """Test suite for InstagramGraphQL._parse_post_data."""
+
+    def test_parses_carousel_post(self):
+        """Carousel children, caption, owner and engagement are flattened."""
+        data = {
+            '__typename': 'GraphSidecar',
+            'display_url': 'https://cdn/main.jpg',
+            'taken_at_timestamp': 1700000000,
+            'dimensions': {'width': 1080, 'height': 1350},
+            'edge_media_to_caption': {'edges': [{'node': {'text': 'hello'}}]},
+            'edge_media_preview_like': {'count': 5},
+            'owner': {'username': 'someone'},
+            'edge_sidecar_to_children': {'edges': [
+                {'node': {'is_video': True, 'video_url': 'https://cdn/1.mp4'}},
+                {'node': {'display_url': 'https://cdn/2.jpg', 'dimensions': {'width': 640}}},
+            ]},
+        }
+        parsed = InstagramGraphQL()._parse_post_data(data, 'abc123')
+        assert parsed.is_carousel is True
+        assert [item['url'] for item in parsed.carousel_items] == ['https://cdn/1.mp4', 'https://cdn/2.jpg']
+        assert parsed.carousel_items[1]['width'] == 640
+        assert parsed.caption == 'hello'
+        assert parsed.thumbnail_url == 'https://cdn/main.jpg'
+        assert (parsed.width, parsed.likes, parsed.comments) == (1080, 5, 0)
+        assert parsed.author['username'] == 'someone'
+
+    def test_null_fields_fall_back_to_defaults(self):
+        """Keys present with a null value are treated like missing keys."""
+        data = {'owner': None, 'dimensions': None, 'location': None, 'edge_media_to_caption': None}
+        parsed = InstagramGraphQL()._parse_post_data(data, 'abc123')
+        assert parsed.caption == ''
+        assert parsed.width is None
+        assert parsed.location is None
+        assert parsed.author['username'] == ''
+        assert parsed.is_carousel is False
+
+    def test_to_dict_returns_plain_dict(self):
+        """to_dict keeps the original dict shape, with carousel items as a list."""
+        parsed = InstagramGraphQL()._parse_post_data({'display_url': 'https://cdn/a.jpg'}, 'abc123')
+        data = parsed.to_dict()
+        assert data['shortcode'] == 'abc123'
+        assert data['thumbnail_url'] == 'https://cdn/a.jpg'
+        assert data['carousel_items'] == []
+
+
+class TestRetryAfterSeconds:
+    """Test suite for _retry_after_seconds."""
+
+    def test_uses_header_seconds_or_default(self):
+        """Delta-seconds values are used as-is; missing or bad values use the default."""
+        assert _retry_after_seconds(SimpleNamespace(headers={'Retry-After': '120'})) == 120
+        assert _retry_after_seconds(SimpleNamespace(headers={})) == 300
+        assert _retry_after_seconds(SimpleNamespace(headers={'Retry-After': 'soon'}), default=60) == 60
+
+    def test_past_http_date_clamps_to_zero(self):
+        """An HTTP-date already in the past means no wait."""
+        response = SimpleNamespace(headers={'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'})
+        assert _retry_after_seconds(response) == 0
@@ -0,0 +1,32 @@
+"""Unit tests for embed-page parsing in the proxy downloader.
+
+Tests cover reading the post's media type from the embed page's structured
+data, including JSON escaped inside a JS string.
+"""
+
+from app.instagram_proxy import _embed_media_type
+
+
+class TestEmbedMediaType:
+    """Test suite for _embed_media_type."""
+
+    def test_typename(self):
+        """__typename decides the type; the first match is the post itself."""
+        html = '{"shortcode_media": {"__typename": "GraphSidecar", "edges": [{"__typename": "GraphImage"}]}}'
+        assert _embed_media_type(html) == 'carousel'
+        assert _embed_media_type('{"__typename":"XDTGraphVideo"}') == 'video'
+
+    def test_escaped_json_in_script_string(self):
+        """JSON embedded as an escaped JS string literal is still read."""
+        html = r'"contextJSON":"{\"__typename\":\"GraphImage\",\"is_video\":false}"'
+        assert _embed_media_type(html) == 'photo'
+
+    def test_is_video_fallback(self):
+        """Without __typename, is_video tells videos from photos."""
+        assert _embed_media_type('{"is_video": true}') == 'video'
+        assert _embed_media_type('{"is_video":false}') == 'photo'
+
+    def test_poster_jpg_only_is_inconclusive(self):
+        """A page with only CDN image URLs and no structured data gives None."""
+        html = '<img src="https://scontent.cdninstagram.com/v/poster.jpg">'
+        assert _embed_media_type(html) is None
@@ -3,6 +3,8 @@
 Tests cover various URL formats and edge cases to ensure robust parsing.
 """
 
+from types import SimpleNamespace
+
 import pytest
 from app.parser import ReelsURLParser
 from app.exceptions import InvalidURLError
@@ -41,6 +43,19 @@ class TestReelsURLParser:
         result = ReelsURLParser.extract_shortcode(url)
         assert result == "ABC_123-xyz"
 
+    def test_extract_shortcode_from_parsed_url(self):
+        """Pre-parsed URL objects (e.g. pydantic HttpUrl) are read via host/path."""
+        url = SimpleNamespace(host="www.instagram.com", path="/reel/ABC_123-xyz/")
+        result = ReelsURLParser.extract_shortcode(url)
+        assert result == "ABC_123-xyz"
+
+    def test_is_post_url(self):
+        """Only /p/ URLs count as posts; reels and IGTV don't."""
+        assert ReelsURLParser.is_post_url("https://www.instagram.com/p/ABC_123-xyz/")
+        assert ReelsURLParser.is_post_url(SimpleNamespace(host="instagram.com", path="/p/ABC_123-xyz/"))
+        assert not ReelsURLParser.is_post_url("https://www.instagram.com/reel/ABC_123-xyz/")
+        assert not ReelsURLParser.is_post_url("https://www.instagram.com/tv/ABC_123-xyz/")
+
     def test_invalid_url_empty_string(self):
         """Empty string should raise InvalidURLError."""
         with pytest.raises(InvalidURLError, match="non-empty string"):
@@ -0,0 +1,71 @@
+"""Unit tests for the per-host outbound rate limiter.
+
+Tests cover burst capacity, steady-rate waits, Retry-After back-off, the
+wait cap, and Retry-After parsing.
+"""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+from app.exceptions import RateLimitExceededError
+from app.rate_limiter import HostRateLimiter, parse_retry_after
+
+
+class TestHostRateLimiter:
+    """Test suite for HostRateLimiter."""
+
+    def test_burst_passes_then_requests_are_spaced(self, clock):
+        """The first `burst` requests don't wait; later ones wait 1/rate each."""
+        limiter = HostRateLimiter(rate_per_second=2, burst=3)
+        assert [limiter.acquire("instagram.com") for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert limiter.acquire("instagram.com") == pytest.approx(0.5)
+        assert limiter.acquire("instagram.com") == pytest.approx(0.5)
+
+    def test_hosts_have_separate_buckets(self, clock):
+        """Exhausting one host's bucket doesn't delay another host."""
+        limiter = HostRateLimiter(rate_per_second=1, burst=1)
+        limiter.acquire("instagram.com")
+        assert limiter.acquire("graph.facebook.com") == 0.0
+
+    def test_retry_after_pauses_host(self, clock):
+        """A 429 with Retry-After blocks the host for that long, then resumes at the steady rate."""
+        limiter = HostRateLimiter(rate_per_second=1, burst=5, max_wait_seconds=60)
+        limiter.observe("instagram.com", 429, {"Retry-After": "30"})
+        assert limiter.acquire("instagram.com") == pytest.approx(31)
+        assert limiter.acquire("instagram.com") == pytest.approx(1)
+
+    def test_wait_beyond_cap_raises_without_reserving(self, clock):
+        """A pause longer than max_wait_seconds fails fast and leaves the schedule unchanged."""
+        limiter = HostRateLimiter(rate_per_second=1, burst=5, max_wait_seconds=10)
+        limiter.observe("instagram.com", 429, {"Retry-After": "600"})
+        with pytest.raises(RateLimitExceededError) as exc_info:
+            limiter.acquire("instagram.com")
+        assert exc_info.value.details == {"host": "instagram.com", "retry_after_seconds": 601}
+
+        clock[0] += 600
+        assert limiter.acquire("instagram.com") == pytest.approx(1)
+
+    def test_http_date_retry_after_pauses_host(self, clock):
+        """Retry-After sent as an HTTP-date is honoured instead of the 60s fallback."""
+        limiter = HostRateLimiter(rate_per_second=1, burst=5, max_wait_seconds=300)
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=120)
+        limiter.observe("instagram.com", 503, {"Retry-After": format_datetime(retry_at, usegmt=True)})
+        assert 100 < limiter.acquire("instagram.com") <= 121
+
+
+class TestParseRetryAfter:
+    """Test suite for parse_retry_after."""
+
+    def test_delta_seconds(self):
+        """Delta-seconds values are used as-is."""
+        assert parse_retry_after("120") == 120.0
+
+    def test_missing_or_invalid_value(self):
+        """Missing or unparseable values return None so callers pick their own default."""
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+
+    def test_past_http_date_clamps_to_zero(self):
+        """An HTTP-date already in the past means no wait."""
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
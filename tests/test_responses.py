@@ -0,0 +1,156 @@
+"""Unit tests for the /downloads response helpers.
+
+Tests cover error-to-response mapping, conditional GET (If-None-Match /
+If-Modified-Since), Range header parsing (suffix, open-ended, reversed and
+out-of-bounds ranges) and If-Range validation.
+"""
+
+import orjson
+import pytest
+from app.exceptions import (
+    AuthenticationError,
+    ContentNotFoundError,
+    ReelsDownloaderError,
+    ServerBusyError,
+)
+from app.responses import error_response, if_range_matches, is_not_modified, parse_range
+
+LAST_MODIFIED = "Wed, 21 Oct 2015 07:28:00 GMT"
+MTIME = 1445412480.5  # LAST_MODIFIED plus a fraction of a second
+ETAG = 'W/"5f1a-400"'
+
+
+class TestErrorResponse:
+    """Test suite for error_response."""
+
+    def test_mapped_error(self):
+        """A mapped error class gets its own status, error_type and JSON body."""
+        response = error_response(ContentNotFoundError("gone", details={"shortcode": "ABC_123-xyz"}))
+        assert response.status_code == 404
+        assert orjson.loads(response.body) == {
+            "status": "error",
+            "error_type": "content_not_found",
+            "message": "gone",
+            "details": {"shortcode": "ABC_123-xyz"},
+        }
+        assert "retry-after" not in response.headers
+
+    def test_unmapped_subclass_uses_nearest_parent(self):
+        """Subclasses without an entry fall back along the MRO to their parent's mapping."""
+        response = error_response(AuthenticationError("login failed"))
+        assert response.status_code == 500
+        assert orjson.loads(response.body)["error_type"] == "download_failed"
+
+    def test_subclass_of_mapped_error(self):
+        """A subclass of a mapped error inherits that error's mapping, not the base one."""
+
+        class PostGoneError(ContentNotFoundError):
+            pass
+
+        response = error_response(PostGoneError("gone"))
+        assert response.status_code == 404
+        assert orjson.loads(response.body)["error_type"] == "content_not_found"
+
+    def test_server_busy_sets_retry_after(self):
+        """retry_after_seconds in details becomes a Retry-After header."""
+        response = error_response(ServerBusyError("busy", details={"retry_after_seconds": 5}))
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "5"
+        assert orjson.loads(response.body)["error_type"] == "server_busy"
+
+    def test_base_error(self):
+        """The base error maps to a generic download failure."""
+        assert error_response(ReelsDownloaderError("boom")).status_code == 500
+
+
+class TestIsNotModified:
+    """Test suite for is_not_modified."""
+
+    def test_no_validators(self):
+        """Without conditional headers the full response is sent."""
+        assert not is_not_modified({}, ETAG, MTIME)
+
+    def test_if_none_match_wildcard(self):
+        """If-None-Match: * matches any current representation."""
+        assert is_not_modified({"if-none-match": "*"}, ETAG, MTIME)
+
+    def test_if_none_match_list(self):
+        """Any tag in a comma-separated list may match."""
+        assert is_not_modified({"if-none-match": '"other", W/"5f1a-400"'}, ETAG, MTIME)
+        assert not is_not_modified({"if-none-match": '"other", "another"'}, ETAG, MTIME)
+
+    def test_if_none_match_uses_weak_comparison(self):
+        """Weak and strong forms of the same tag match each other."""
+        assert is_not_modified({"if-none-match": '"5f1a-400"'}, ETAG, MTIME)
+
+    def test_if_none_match_overrides_if_modified_since(self):
+        """If-Modified-Since is ignored when If-None-Match is present."""
+        headers = {"if-none-match": '"other"', "if-modified-since": LAST_MODIFIED}
+        assert not is_not_modified(headers, ETAG, MTIME)
+
+    def test_if_modified_since(self):
+        """Dates at or after the file's whole-second mtime mean not modified."""
+        assert is_not_modified({"if-modified-since": LAST_MODIFIED}, ETAG, MTIME)
+        assert not is_not_modified({"if-modified-since": "Tue, 20 Oct 2015 07:28:00 GMT"}, ETAG, MTIME)
+        assert not is_not_modified({"if-modified-since": "yesterday"}, ETAG, MTIME)
+
+
+class TestParseRange:
+    """Test suite for parse_range."""
+
+    def test_closed_range(self):
+        """An explicit first-last range is returned inclusive."""
+        assert parse_range("bytes=0-99", 1000) == (0, 99)
+
+    def test_open_ended_range(self):
+        """A range without a last byte runs to the end of the file."""
+        assert parse_range("bytes=500-", 1000) == (500, 999)
+
+    def test_suffix_range(self):
+        """A suffix range selects the final N bytes, clamped to the file size."""
+        assert parse_range("bytes=-100", 1000) == (900, 999)
+        assert parse_range("bytes=-5000", 1000) == (0, 999)
+
+    def test_last_byte_past_end_is_clamped(self):
+        """A last byte beyond the file is clamped to the final byte."""
+        assert parse_range("bytes=900-5000", 1000) == (900, 999)
+
+    def test_reversed_range_is_ignored(self):
+        """A range whose last byte precedes its first is ignored (full file)."""
+        assert parse_range("bytes=500-100", 1000) is None
+
+    def test_malformed_or_multi_range_is_ignored(self):
+        """Other units, garbage and multi-range requests are ignored."""
+        assert parse_range("items=0-10", 1000) is None
+        assert parse_range("bytes=abc", 1000) is None
+        assert parse_range("bytes=0-10,20-30", 1000) is None
+
+    def test_unsatisfiable_range_raises(self):
+        """Ranges entirely outside the file raise ValueError (served as 416)."""
+        with pytest.raises(ValueError):
+            parse_range("bytes=1000-", 1000)
+        with pytest.raises(ValueError):
+            parse_range("bytes=-0", 1000)
+        with pytest.raises(ValueError):
+            parse_range("bytes=-10", 0)
+
+
+class TestIfRangeMatches:
+    """Test suite for if_range_matches."""
+
+    def test_missing_if_range_allows_range(self):
+        """Without If-Range the range is always honoured."""
+        assert if_range_matches(None, LAST_MODIFIED)
+
+    def test_matching_date_allows_range(self):
+        """A date equal to Last-Modified means the client's partial copy is current."""
+        assert if_range_matches(LAST_MODIFIED, LAST_MODIFIED)
+
+    def test_other_date_sends_full_file(self):
+        """A different date means the file changed since the partial copy."""
+        assert not if_range_matches("Thu, 22 Oct 2015 07:28:00 GMT", LAST_MODIFIED)
+
+    def test_entity_tags_never_match(self):
+        """If-Range requires a strong comparison, which our weak ETags never pass."""
+        assert not if_range_matches('W/"abc-10"', LAST_MODIFIED)
+        assert not if_range_matches('"abc-10"', LAST_MODIFIED)